@@ -4,19 +4,45 @@ import time
 import keyboard
 from core.act import Act
 from core.sensor import Sensor
-from core.think import Think
+from core.think import MoveStrategy, Think
 from logger_config import logger
 
 
 class Bot:
-    def __init__(self, ocr_method, grade_method, hotkey: str = "F8"):
+    def __init__(
+        self,
+        ocr_method,
+        grade_method,
+        move_strategy: MoveStrategy = MoveStrategy.MAIS_VAZIOS,
+        hotkey: str = "F8",
+        ocr_cache: bool = False,  # Cache persistente do OCR (sensor.ocr_cache)
+        diferenca_quadros: bool = False,  # Relê só os tiles que mudaram
+        registrar_tiles: bool = False,  # Grava tiles lidos em dados/tiles
+        leitura_prevista: bool = False,
+        especulativo: bool = False,
+    ):
         self.hotkey = hotkey
+        # Confere só o tile novo a partir do tabuleiro previsto pelo Think
+        self.leitura_prevista = leitura_prevista
+        # Pipeline: calcula a próxima jogada durante a animação da atual
+        self.especulativo = especulativo
         self.bot_ativo = False
 
         # Componentes principais
-        self.sensor = Sensor("Google Chrome", ocr_method, grade_method)
-        self.think = Think()
+        self.sensor = Sensor(
+            "Google Chrome",
+            ocr_method,
+            grade_method,
+            ocr_cache=ocr_cache,
+            diferenca_quadros=diferenca_quadros,
+            registrar_tiles=registrar_tiles,
+        )
+        self.think = Think(move_strategy)
         self.act = Act()
+        # Latência de animação de cada movimento (s), medida pelo Sensor
+        self.settle_times: list[float] = []
+        # Tempo de decisão de cada movimento (s), do tabuleiro lido à jogada
+        self.decision_times: list[float] = []
         # Atalho para pausar/retomar (mesmo padrão dos outros projetos)
         threading.Thread(
             target=lambda: keyboard.add_hotkey(self.hotkey, self.toggle), daemon=True
@@ -32,8 +58,10 @@ class Bot:
         coords = self.sensor.match_template("new_game")
         if coords:
             self.act.click(*coords)
+            self.think.nova_partida()
+            self.sensor.salvar_cache()
             logger.info("Clicou em New Game para reiniciar.")
-            time.sleep(0.2)
+            self.sensor.aguardar_estabilidade()
             return True
         else:
             logger.warning("Botão 'New Game' não encontrado.")
@@ -47,7 +75,8 @@ class Bot:
             )
             return
         self.act.click(*coords)
-        time.sleep(0.2)
+        self.think.nova_partida()
+        self.sensor.aguardar_estabilidade()
 
     def run(self, max_movimentos: int = 9999):
         # Espera ativação do bot
@@ -57,6 +86,7 @@ class Bot:
         falhas_grid = 0
         movimentos = 0
         ultimo_board = None
+        previsto = None
         inicio = time.perf_counter_ns()
 
         while movimentos < max_movimentos:
@@ -64,31 +94,60 @@ class Bot:
                 time.sleep(0.5)
 
             try:
-                board = self.sensor.get_grid()
+                board = self.sensor.get_grid(previsto)
             except Exception as e:
                 falhas_grid += 1
                 logger.error(f"Falha ao detectar grid ({falhas_grid}ª): {e}")
                 # Agregado maior número do board passando board como parâmetro e obtido pontuação independemente se o último board é None ou não
+                self.think.parar_especulacao()
                 duracao = time.perf_counter_ns() - inicio
                 return ultimo_board, falhas_grid, duracao
 
+            inicio_decisao = time.perf_counter()
             move, next_board = self.think.best_move(board)
+            self.decision_times.append(time.perf_counter() - inicio_decisao)
             ultimo_board = next_board
+            if self.leitura_prevista:
+                previsto = next_board
             if move:
                 self.act.executar_jogada(move)
+                if self.especulativo:
+                    self.think.especular(next_board)
                 movimentos += 1
-                logger.debug(f"Movimento {movimentos}/{max_movimentos}")
-                time.sleep(0.2)
+                self.settle_times.append(self.sensor.aguardar_estabilidade())
+                logger.debug(
+                    f"Movimento {movimentos}/{max_movimentos} "
+                    f"(decisão: {self.decision_times[-1] * 1000:.0f} ms, "
+                    f"animação: {self.settle_times[-1] * 1000:.0f} ms)"
+                )
             else:
                 logger.info("Fim de jogo detectado.")
                 # Agregado maior número do board passando board como parâmetro e obtido pontuação independemente se o último board é None ou não
+                self.think.parar_especulacao()
                 duracao = time.perf_counter_ns() - inicio
                 return board, falhas_grid, duracao
 
         # atingiu limite de movimentos
         logger.info(f"Atingiu o limite de {max_movimentos} movimentos.")
+        # A especulação do último movimento não pode seguir rodando (e mexendo
+        # nas estatísticas da busca) depois que a partida termina
+        self.think.parar_especulacao()
         duracao = time.perf_counter_ns() - inicio
         return ultimo_board, falhas_grid, duracao
 
+    def estatisticas_animacao(self) -> dict[str, float]:
+        """Resumo das esperas de animação e dos tempos de decisão desde a
+        última chamada (uma vez por partida); zera settle_times e
+        decision_times"""
+        resumo = {}
+        for nome, tempos in (
+            ("animacao", self.settle_times),
+            ("decisao", self.decision_times),
+        ):
+            resumo[f"{nome}_media"] = sum(tempos) / len(tempos) if tempos else 0.0
+            resumo[f"{nome}_max"] = max(tempos, default=0.0)
+            tempos.clear()
+        return resumo
+
     def is_active(self):
         return self.bot_ativo
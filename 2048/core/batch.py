@@ -0,0 +1,140 @@
+"""Movimentos do 2048 vetorizados sobre N tabuleiros de uma vez.
+
+Usa as mesmas tabelas de linha do bitboard, mas indexadas por arrays NumPy,
+para avançar milhares de tabuleiros (rollouts, simulador) em uma chamada.
+Os tabuleiros podem vir compactados ``(N,)`` uint64 ou como valores
+``(N, 4, 4)``; a saída segue o formato da entrada.
+"""
+
+import numpy as np
+from core import bitboard
+
+# Ordem das ações igual a bitboard.MOVES
+ACOES = tuple(bitboard.MOVES)
+UP, DOWN, LEFT, RIGHT = range(4)
+
+_ROW_LEFT = np.array(bitboard.ROW_LEFT, dtype=np.uint64)
+_ROW_RIGHT = np.array(bitboard.ROW_RIGHT, dtype=np.uint64)
+_ROW_SCORE = np.array(bitboard.ROW_SCORE, dtype=np.int64)
+_SHIFTS = np.arange(0, 64, 4, dtype=np.uint64)
+_ROW_SHIFTS = (np.uint64(0), np.uint64(16), np.uint64(32), np.uint64(48))
+_M = np.uint64(0xFFFF)
+
+
+def encode(boards: np.ndarray) -> np.ndarray:
+    """Compacta (N, 4, 4) valores em (N,) bitboards uint64"""
+    valores = np.asarray(boards).reshape(len(boards), 16)
+    expoentes = np.zeros(valores.shape, dtype=np.uint64)
+    ocupado = valores > 0
+    expoentes[ocupado] = np.log2(valores[ocupado]).astype(np.uint64)
+    return np.bitwise_or.reduce(expoentes << _SHIFTS, axis=1)
+
+
+def decode(estados: np.ndarray) -> np.ndarray:
+    """Expande (N,) bitboards uint64 em (N, 4, 4) valores"""
+    expoentes = (estados[:, None] >> _SHIFTS) & np.uint64(0xF)
+    valores = np.where(expoentes > 0, np.left_shift(1, expoentes.astype(np.int64)), 0)
+    return valores.reshape(len(estados), 4, 4)
+
+
+def transpose(estados: np.ndarray) -> np.ndarray:
+    """Transpõe todos os bitboards (mesma manipulação de bits do escalar)"""
+    x = estados
+    a1 = x & np.uint64(0xF0F0_0F0F_F0F0_0F0F)
+    a2 = x & np.uint64(0x0000_F0F0_0000_F0F0)
+    a3 = x & np.uint64(0x0F0F_0000_0F0F_0000)
+    a = a1 | (a2 << np.uint64(12)) | (a3 >> np.uint64(12))
+    b1 = a & np.uint64(0xFF00_FF00_00FF_00FF)
+    b2 = a & np.uint64(0x00FF_00FF_0000_0000)
+    b3 = a & np.uint64(0x0000_0000_FF00_FF00)
+    return b1 | (b2 >> np.uint64(24)) | (b3 << np.uint64(24))
+
+
+def _aplicar_linhas(estados: np.ndarray, tabela: np.ndarray) -> np.ndarray:
+    novos = np.zeros_like(estados)
+    for shift in _ROW_SHIFTS:
+        novos |= tabela[(estados >> shift) & _M] << shift
+    return novos
+
+
+def score(estados: np.ndarray) -> np.ndarray:
+    """Pontuação acumulada pelos tiles de cada bitboard (ver bitboard.score)"""
+    total = np.zeros(len(estados), dtype=np.int64)
+    for shift in _ROW_SHIFTS:
+        total += _ROW_SCORE[(estados >> shift) & _M]
+    return total
+
+
+def mover(estados: np.ndarray, direcao: int) -> np.ndarray:
+    """Aplica a mesma direção a todos os bitboards (N,) uint64"""
+    if direcao == LEFT:
+        return _aplicar_linhas(estados, _ROW_LEFT)
+    if direcao == RIGHT:
+        return _aplicar_linhas(estados, _ROW_RIGHT)
+    tabela = _ROW_LEFT if direcao == UP else _ROW_RIGHT
+    return transpose(_aplicar_linhas(transpose(estados), tabela))
+
+
+def mover_todos(estados: np.ndarray) -> np.ndarray:
+    """Aplica as 4 direções a todos os bitboards
+
+    Returns:
+        np.ndarray: (4, N) bitboards, na ordem de ACOES
+    """
+    return np.stack([mover(estados, d) for d in range(4)])
+
+
+def mover_lote(
+    boards: np.ndarray, acoes: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Aplica uma ação por tabuleiro em N tabuleiros
+
+    Args:
+        boards (np.ndarray): (N,) bitboards uint64 ou (N, 4, 4) valores
+        acoes (np.ndarray): (N,) índices em ACOES (0=up, 1=down, 2=left, 3=right)
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray]: Próximos tabuleiros (mesmo
+        formato da entrada, sem o tile novo), máscara de movimentos válidos e
+        pontos ganhos nas junções
+    """
+    matriz = np.ndim(boards) == 3
+    estados = encode(boards) if matriz else np.asarray(boards, dtype=np.uint64)
+    acoes = np.asarray(acoes)
+
+    novos = estados.copy()
+    for direcao in range(4):
+        idx = acoes == direcao
+        if idx.any():
+            novos[idx] = mover(estados[idx], direcao)
+
+    validos = novos != estados
+    recompensas = score(novos) - score(estados)
+    return (decode(novos) if matriz else novos), validos, recompensas
+
+
+def spawn_lote(
+    estados: np.ndarray, rng: np.random.Generator
+) -> tuple[np.ndarray, np.ndarray]:
+    """Gera um 2 (90%) ou 4 (10%) em uma célula vazia de cada bitboard
+
+    Args:
+        estados (np.ndarray): (N,) bitboards uint64
+        rng (np.random.Generator): Gerador de números aleatórios
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Bitboards com o tile novo (os cheios
+        ficam iguais) e máscara de onde surgiu um 4
+    """
+    vazios = ((estados[:, None] >> _SHIFTS) & np.uint64(0xF)) == 0
+    n_vazios = vazios.sum(axis=1)
+    tem_vazio = n_vazios > 0
+
+    # Escolhe o k-ésimo vazio de cada linha
+    k = (rng.random(len(estados)) * n_vazios).astype(np.int64)
+    celula = np.argmax(np.cumsum(vazios, axis=1) > k[:, None], axis=1)
+
+    quatro = (rng.random(len(estados)) < bitboard.PROB_4) & tem_vazio
+    valor = np.where(quatro, 2, 1).astype(np.uint64)
+    tile = np.where(tem_vazio, valor << (celula.astype(np.uint64) * np.uint64(4)), 0)
+    return estados | tile.astype(np.uint64), quatro
@@ -0,0 +1,258 @@
+"""Tabuleiro do 2048 compactado em um inteiro de 64 bits (bitboard).
+
+Cada célula ocupa 4 bits com o expoente log2 do valor (0 = vazio, 1 = 2,
+2 = 4, ..., 15 = 32768). A linha ``r`` fica nos bits ``16 * r`` a
+``16 * r + 15`` e, dentro da linha, a coluna ``c`` fica no nibble ``c``
+(a coluna 0 é o nibble menos significativo).
+
+Os movimentos são resolvidos por tabelas pré-computadas com as 65.536
+linhas possíveis, de forma que um movimento custa apenas quatro consultas.
+"""
+
+import numpy as np
+
+ROW_MASK = 0xFFFF
+COL_MASK = 0x000F_000F_000F_000F
+MAX_EXPOENTE = 15
+
+# Distribuição do tile novo, usada pela busca, pelos rollouts e pelo simulador
+PROB_2 = 0.9
+PROB_4 = 0.1
+
+
+def _reverse_rows(rows: np.ndarray) -> np.ndarray:
+    """Inverte a ordem dos nibbles de cada linha de 16 bits"""
+    return (
+        ((rows >> 12) & 0xF)
+        | ((rows >> 4) & 0xF0)
+        | ((rows << 4) & 0xF00)
+        | ((rows << 12) & 0xF000)
+    )
+
+
+def _unpack_cols(rows: np.ndarray) -> np.ndarray:
+    """Espalha os 4 nibbles de uma linha na coluna 0 de um tabuleiro"""
+    rows = rows.astype(np.uint64)
+    return (
+        (rows & 0xF)
+        | ((rows & 0xF0) << 12)
+        | ((rows & 0xF00) << 24)
+        | ((rows & 0xF000) << 36)
+    )
+
+
+def _build_tables() -> tuple[np.ndarray, ...]:
+    """Calcula o resultado do movimento de todas as 65.536 linhas possíveis
+
+    Returns:
+        tuple[np.ndarray, ...]: Linhas após mover para a esquerda e para a
+        direita, deltas (XOR) das colunas após mover para cima e para baixo e a
+        pontuação acumulada pelos tiles da linha
+    """
+    rows = np.arange(1 << 16, dtype=np.uint64)
+    cells = np.stack([(rows >> (4 * i)) & 0xF for i in range(4)], axis=1)
+
+    # Compacta as células não vazias para a esquerda (ordenação estável)
+    order = np.argsort(cells == 0, axis=1, kind="stable")
+    line = np.take_along_axis(cells, order, axis=1)
+
+    # Junta pares iguais da esquerda para a direita
+    for i in range(3):
+        eq = (line[:, i] != 0) & (line[:, i] == line[:, i + 1])
+        line[eq, i] = np.minimum(line[eq, i] + 1, MAX_EXPOENTE)
+        line[eq, i + 1 : 3] = line[eq, i + 2 : 4]
+        line[eq, 3] = 0
+
+    left = line[:, 0] | (line[:, 1] << 4) | (line[:, 2] << 8) | (line[:, 3] << 12)
+    rev = _reverse_rows(rows)
+    right = _reverse_rows(left[rev])
+
+    col_up = _unpack_cols(rows) ^ _unpack_cols(left)
+    col_down = _unpack_cols(rows) ^ _unpack_cols(right)
+
+    # Um tile 2^r (r >= 2) rendeu (r - 1) * 2^r pontos em junções até existir
+    ranks = cells.astype(np.int64)
+    pontos = np.where(ranks >= 2, (ranks - 1) << ranks, 0).sum(axis=1)
+    return left, right, col_up, col_down, pontos
+
+
+_ROW_LEFT, _ROW_RIGHT, _COL_UP, _COL_DOWN, _ROW_SCORE = _build_tables()
+
+# Listas de inteiros Python: a indexação escalar é bem mais rápida que em arrays
+ROW_LEFT: list[int] = _ROW_LEFT.tolist()
+ROW_RIGHT: list[int] = _ROW_RIGHT.tolist()
+COL_UP: list[int] = _COL_UP.tolist()
+COL_DOWN: list[int] = _COL_DOWN.tolist()
+ROW_SCORE: list[int] = _ROW_SCORE.tolist()
+ROW_REVERSE: list[int] = _reverse_rows(np.arange(1 << 16, dtype=np.uint64)).tolist()
+
+
+def encode(board: np.ndarray) -> int:
+    """Compacta uma matriz 4x4 com os valores dos tiles em um bitboard
+
+    Args:
+        board (np.ndarray): Matriz com os valores (0, 2, 4, 8, ...)
+
+    Returns:
+        int: Bitboard
+    """
+    estado = 0
+    for i, valor in enumerate(np.asarray(board).ravel().tolist()):
+        if valor > 0:
+            expoente = min(int(valor).bit_length() - 1, MAX_EXPOENTE)
+            estado |= expoente << (4 * i)
+    return estado
+
+
+def decode(estado: int) -> np.ndarray:
+    """Expande um bitboard para a matriz 4x4 com os valores dos tiles
+
+    Args:
+        estado (int): Bitboard
+
+    Returns:
+        np.ndarray: Matriz com os valores (0, 2, 4, 8, ...)
+    """
+    expoentes = np.array([(estado >> (4 * i)) & 0xF for i in range(16)])
+    valores = np.where(expoentes > 0, np.left_shift(1, expoentes), 0)
+    return valores.reshape((4, 4))
+
+
+def transpose(estado: int) -> int:
+    """Transpõe o tabuleiro (linhas viram colunas)"""
+    a1 = estado & 0xF0F0_0F0F_F0F0_0F0F
+    a2 = estado & 0x0000_F0F0_0000_F0F0
+    a3 = estado & 0x0F0F_0000_0F0F_0000
+    a = a1 | (a2 << 12) | (a3 >> 12)
+    b1 = a & 0xFF00_FF00_00FF_00FF
+    b2 = a & 0x00FF_00FF_0000_0000
+    b3 = a & 0x0000_0000_FF00_FF00
+    return b1 | (b2 >> 24) | (b3 << 24)
+
+
+def flip_h(estado: int) -> int:
+    """Espelha o tabuleiro na horizontal (inverte a ordem das colunas)"""
+    return (
+        ROW_REVERSE[estado & ROW_MASK]
+        | (ROW_REVERSE[(estado >> 16) & ROW_MASK] << 16)
+        | (ROW_REVERSE[(estado >> 32) & ROW_MASK] << 32)
+        | (ROW_REVERSE[(estado >> 48) & ROW_MASK] << 48)
+    )
+
+
+def flip_v(estado: int) -> int:
+    """Espelha o tabuleiro na vertical (inverte a ordem das linhas)"""
+    return (
+        ((estado & ROW_MASK) << 48)
+        | (((estado >> 16) & ROW_MASK) << 32)
+        | (((estado >> 32) & ROW_MASK) << 16)
+        | (estado >> 48)
+    )
+
+
+def simetrias(estado: int) -> tuple[int, ...]:
+    """As 8 simetrias do tabuleiro (rotações e reflexões)
+
+    Returns:
+        tuple[int, ...]: Na ordem I, H, V, HV, T, TH, TV, THV (sequência de
+        transposição T, espelho horizontal H e vertical V aplicados em ordem)
+    """
+    h = flip_h(estado)
+    t = transpose(estado)
+    th = flip_h(t)
+    return (estado, h, flip_v(estado), flip_v(h), t, th, flip_v(t), flip_v(th))
+
+
+def move_left(estado: int) -> int:
+    return (
+        ROW_LEFT[estado & ROW_MASK]
+        | (ROW_LEFT[(estado >> 16) & ROW_MASK] << 16)
+        | (ROW_LEFT[(estado >> 32) & ROW_MASK] << 32)
+        | (ROW_LEFT[(estado >> 48) & ROW_MASK] << 48)
+    )
+
+
+def move_right(estado: int) -> int:
+    return (
+        ROW_RIGHT[estado & ROW_MASK]
+        | (ROW_RIGHT[(estado >> 16) & ROW_MASK] << 16)
+        | (ROW_RIGHT[(estado >> 32) & ROW_MASK] << 32)
+        | (ROW_RIGHT[(estado >> 48) & ROW_MASK] << 48)
+    )
+
+
+def move_up(estado: int) -> int:
+    t = transpose(estado)
+    return (
+        estado
+        ^ COL_UP[t & ROW_MASK]
+        ^ (COL_UP[(t >> 16) & ROW_MASK] << 4)
+        ^ (COL_UP[(t >> 32) & ROW_MASK] << 8)
+        ^ (COL_UP[(t >> 48) & ROW_MASK] << 12)
+    )
+
+
+def move_down(estado: int) -> int:
+    t = transpose(estado)
+    return (
+        estado
+        ^ COL_DOWN[t & ROW_MASK]
+        ^ (COL_DOWN[(t >> 16) & ROW_MASK] << 4)
+        ^ (COL_DOWN[(t >> 32) & ROW_MASK] << 8)
+        ^ (COL_DOWN[(t >> 48) & ROW_MASK] << 12)
+    )
+
+
+MOVES = {
+    "up": move_up,
+    "down": move_down,
+    "left": move_left,
+    "right": move_right,
+}
+
+
+def move(estado: int, direcao: str) -> int:
+    """Aplica um movimento ao bitboard
+
+    Args:
+        estado (int): Bitboard
+        direcao (str): "up", "down", "left" ou "right"
+
+    Returns:
+        int: Bitboard após o movimento (igual ao original se inválido)
+    """
+    return MOVES[direcao](estado)
+
+
+def count_empty(estado: int) -> int:
+    """Conta as células vazias do bitboard"""
+    estado |= (estado >> 2) & 0x3333_3333_3333_3333
+    estado |= estado >> 1
+    estado = ~estado & 0x1111_1111_1111_1111
+    return estado.bit_count()
+
+
+def max_tile(estado: int) -> int:
+    """Retorna o valor do maior tile do bitboard"""
+    maior = max((estado >> (4 * i)) & 0xF for i in range(16))
+    return 1 << maior if maior else 0
+
+
+def score(estado: int, quatros: int = 0) -> int:
+    """Pontuação do jogo que leva ao bitboard
+
+    Args:
+        estado (int): Bitboard
+        quatros (int, optional): Quantidade de tiles 4 que surgiram sozinhos
+            (não vieram de junção e não pontuaram). Defaults to 0.
+
+    Returns:
+        int: Pontuação
+    """
+    return (
+        ROW_SCORE[estado & ROW_MASK]
+        + ROW_SCORE[(estado >> 16) & ROW_MASK]
+        + ROW_SCORE[(estado >> 32) & ROW_MASK]
+        + ROW_SCORE[(estado >> 48) & ROW_MASK]
+        - 4 * quatros
+    )
@@ -0,0 +1,140 @@
+"""Tabela de transposição com chaves canônicas sob as 8 simetrias do tabuleiro.
+
+Rotações e reflexões de um tabuleiro têm o mesmo valor (a heurística é
+invariante às simetrias), então todas compartilham uma única entrada: a
+chave é o menor bitboard entre as 8 transformações. O movimento guardado
+fica no referencial canônico e é convertido de volta na consulta.
+"""
+
+from collections import OrderedDict
+from typing import NamedTuple
+
+from core import bitboard
+
+# Cada simetria é uma sequência de transformações elementares (todas involuções)
+_TRANSFORMACOES = {
+    "T": bitboard.transpose,
+    "H": bitboard.flip_h,
+    "V": bitboard.flip_v,
+}
+_MOVIMENTOS = {
+    "T": {"up": "left", "left": "up", "down": "right", "right": "down"},
+    "H": {"up": "up", "down": "down", "left": "right", "right": "left"},
+    "V": {"up": "down", "down": "up", "left": "left", "right": "right"},
+}
+SIMETRIAS = ("", "H", "V", "HV", "T", "TH", "TV", "THV")
+
+
+def canonical_key(estado: int) -> int:
+    """Menor bitboard entre as 8 simetrias (caminho rápido, sem a simetria)"""
+    return min(bitboard.simetrias(estado))
+
+
+def canonical(estado: int) -> tuple[int, str]:
+    """Retorna o menor bitboard entre as 8 simetrias e a simetria que o gera
+
+    Args:
+        estado (int): Bitboard
+
+    Returns:
+        tuple[int, str]: Bitboard canônico e sequência de transformações
+    """
+    return min(zip(bitboard.simetrias(estado), SIMETRIAS))
+
+
+def aplicar_simetria(estado: int, simetria: str) -> int:
+    for passo in simetria:
+        estado = _TRANSFORMACOES[passo](estado)
+    return estado
+
+
+def mapear_movimento(move: str, simetria: str, inversa: bool = False) -> str:
+    """Converte um movimento para o referencial da simetria (ou de volta)"""
+    for passo in reversed(simetria) if inversa else simetria:
+        move = _MOVIMENTOS[passo][move]
+    return move
+
+
+class Entrada(NamedTuple):
+    depth: int
+    valor: float
+    move: str | None
+
+
+class TranspositionCache:
+    def __init__(self, capacidade: int = 200_000) -> None:
+        """Cache LRU limitado para a busca, com chaves canônicas
+
+        Args:
+            capacidade (int, optional): Máximo de entradas. Defaults to 200_000.
+        """
+        self.capacidade = capacidade
+        self.tabela: OrderedDict[int, Entrada] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def chave(self, estado: int, tipo: int = 0) -> int:
+        """Chave canônica do tabuleiro no espaço ``tipo`` (ex.: nó de acaso ou
+        de máximo), para o mesmo bitboard não colidir entre espaços"""
+        return canonical_key(estado) | (tipo << 64)
+
+    def lookup(self, chave: int) -> Entrada | None:
+        """Consulta direta por chave (entradas sem movimento)"""
+        entrada = self.tabela.get(chave)
+        if entrada is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.tabela.move_to_end(chave)
+        return entrada
+
+    def store(self, chave: int, entrada: Entrada) -> None:
+        self.tabela[chave] = entrada
+        self.tabela.move_to_end(chave)
+        if len(self.tabela) > self.capacidade:
+            self.tabela.popitem(last=False)
+
+    def get(self, estado: int, tipo: int = 0) -> Entrada | None:
+        """Busca a entrada do tabuleiro (em qualquer simetria)
+
+        Args:
+            estado (int): Bitboard
+            tipo (int, optional): Espaço de chaves. Defaults to 0.
+
+        Returns:
+            Entrada | None: Entrada com o movimento já no referencial de ``estado``
+        """
+        chave, simetria = canonical(estado)
+        entrada = self.lookup(chave | (tipo << 64))
+        if entrada is None:
+            return None
+        if entrada.move is not None:
+            move = mapear_movimento(entrada.move, simetria, inversa=True)
+            entrada = entrada._replace(move=move)
+        return entrada
+
+    def put(
+        self,
+        estado: int,
+        depth: int,
+        valor: float,
+        move: str | None = None,
+        tipo: int = 0,
+    ) -> None:
+        chave, simetria = canonical(estado)
+        if move is not None:
+            move = mapear_movimento(move, simetria)
+        self.store(chave | (tipo << 64), Entrada(depth, valor, move))
+
+    def clear(self) -> None:
+        self.tabela.clear()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def __len__(self) -> int:
+        return len(self.tabela)
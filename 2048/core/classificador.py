@@ -0,0 +1,147 @@
+"""Classificador linear dos tiles binarizados, treinado com leituras do OCR.
+
+Com registrar_tiles=True, o Sensor grava cada tile lido pelo OCR em
+DATASET_DIR/<valor>/<phash>.png; train_classificador.py ajusta uma regressão
+softmax sobre os tiles reduzidos a 16x16 e salva os pesos em um .npz. A previsão é um produto de matrizes
+para todos os tiles de uma vez.
+"""
+
+from pathlib import Path
+
+import cv2
+import numpy as np
+from logger_config import logger
+
+DATASET_DIR = Path("dados") / "tiles"
+CLASSIFICADOR_PATH = Path("pesos") / "classificador.npz"
+TAMANHO_FEATURES = (16, 16)
+
+
+def features(imgs: list[cv2.typing.MatLike]) -> np.ndarray:
+    """Tiles reduzidos a 16x16 e normalizados para [0, 1]
+
+    Returns:
+        np.ndarray: (N, 256) float32
+    """
+    reduzidas = [
+        cv2.resize(img, TAMANHO_FEATURES, interpolation=cv2.INTER_AREA) for img in imgs
+    ]
+    return np.array(reduzidas, dtype=np.float32).reshape(len(imgs), -1) / 255.0
+
+
+def salvar_exemplo(img: cv2.typing.MatLike, valor: int, chave: int) -> None:
+    """Grava um tile rotulado no dataset (o hash no nome evita duplicatas)"""
+    pasta = DATASET_DIR / str(valor)
+    pasta.mkdir(parents=True, exist_ok=True)
+    cv2.imwrite(str(pasta / f"{chave:016x}.png"), img)
+
+
+def carregar_dataset(
+    pasta: Path = DATASET_DIR,
+) -> tuple[list[cv2.typing.MatLike], np.ndarray]:
+    """Lê os tiles rotulados gravados por salvar_exemplo
+
+    Returns:
+        tuple[list[cv2.typing.MatLike], np.ndarray]: Imagens e valores
+    """
+    imgs, valores = [], []
+    for arquivo in sorted(pasta.glob("*/*.png")):
+        img = cv2.imread(str(arquivo), cv2.IMREAD_GRAYSCALE)
+        if img is not None:
+            imgs.append(img)
+            valores.append(int(arquivo.parent.name))
+    return imgs, np.array(valores, dtype=int)
+
+
+class ClassificadorTiles:
+    def __init__(
+        self, pesos: np.ndarray, bias: np.ndarray, classes: np.ndarray
+    ) -> None:
+        """Regressão softmax sobre as features dos tiles
+
+        Args:
+            pesos (np.ndarray): (256, n_classes)
+            bias (np.ndarray): (n_classes,)
+            classes (np.ndarray): Valor do tile de cada classe
+        """
+        self.pesos = pesos
+        self.bias = bias
+        self.classes = classes
+
+    @classmethod
+    def load(cls, path: Path = CLASSIFICADOR_PATH) -> "ClassificadorTiles":
+        """Carrega os pesos salvos por save()
+
+        Raises:
+            FileNotFoundError: Se o arquivo não existir (rode train_classificador.py)
+        """
+        path = Path(path)
+        if not path.exists():
+            raise FileNotFoundError(
+                f"Classificador não encontrado em {path}. "
+                "Rode train_classificador.py para gerá-lo."
+            )
+        with np.load(path) as dados:
+            return cls(dados["pesos"], dados["bias"], dados["classes"])
+
+    def save(self, path: Path = CLASSIFICADOR_PATH) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez(path, pesos=self.pesos, bias=self.bias, classes=self.classes)
+
+    def probabilidades(self, x: np.ndarray) -> np.ndarray:
+        logits = x @ self.pesos + self.bias
+        logits -= logits.max(axis=1, keepdims=True)
+        exp = np.exp(logits)
+        return exp / exp.sum(axis=1, keepdims=True)
+
+    def prever(self, imgs: list[cv2.typing.MatLike]) -> tuple[np.ndarray, np.ndarray]:
+        """Classifica os tiles
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Valores e confiança (probabilidade
+            da classe escolhida)
+        """
+        if not imgs:
+            return np.zeros(0, dtype=int), np.zeros(0)
+        probs = self.probabilidades(features(imgs))
+        melhor = probs.argmax(axis=1)
+        return self.classes[melhor].astype(int), probs[np.arange(len(imgs)), melhor]
+
+    @classmethod
+    def treinar(
+        cls,
+        imgs: list[cv2.typing.MatLike],
+        valores: np.ndarray,
+        epocas: int = 1000,
+        taxa: float = 2.0,
+        regularizacao: float = 1e-4,
+    ) -> "ClassificadorTiles":
+        """Ajusta a regressão softmax por gradiente descendente (lote inteiro)
+
+        Args:
+            imgs (list[cv2.typing.MatLike]): Tiles binarizados
+            valores (np.ndarray): Valores lidos pelo OCR
+            epocas (int, optional): Passos de gradiente. Defaults to 1000.
+            taxa (float, optional): Taxa de aprendizado. Defaults to 2.0.
+            regularizacao (float, optional): Penalidade L2. Defaults to 1e-4.
+        """
+        x = features(imgs)
+        classes, y = np.unique(valores, return_inverse=True)
+        alvo = np.eye(len(classes), dtype=np.float32)[y]
+
+        modelo = cls(
+            np.zeros((x.shape[1], len(classes)), dtype=np.float32),
+            np.zeros(len(classes), dtype=np.float32),
+            classes,
+        )
+        for epoca in range(1, epocas + 1):
+            erro = (modelo.probabilidades(x) - alvo) / len(x)
+            modelo.pesos -= taxa * (x.T @ erro + regularizacao * modelo.pesos)
+            modelo.bias -= taxa * erro.sum(axis=0)
+            if epoca % 100 == 0:
+                acuracia = np.mean(modelo.probabilidades(x).argmax(axis=1) == y)
+                logger.debug(
+                    f"Época {epoca}/{epocas} | acurácia de treino: {acuracia:.2%}"
+                )
+        return modelo
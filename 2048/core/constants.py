@@ -8,3 +8,47 @@ GRAY = (128, 128, 128)
 
 # Tamanho do tile para OCR
 TILE_SIZE = (64, 64)
+
+# Cor de fundo de cada tile no 2048 original (BGR); 0 = célula vazia.
+# Tiles acima de 2048 usam todos a mesma cor escura e ficam com o OCR
+PALETA_TILES = {
+    0: (180, 193, 205),
+    2: (218, 228, 238),
+    4: (200, 224, 237),
+    8: (121, 177, 242),
+    16: (99, 149, 245),
+    32: (95, 124, 246),
+    64: (59, 94, 246),
+    128: (114, 207, 237),
+    256: (97, 204, 237),
+    512: (80, 200, 237),
+    1024: (63, 197, 237),
+    2048: (46, 194, 237),
+}
+# Distância máxima (BGR) até a cor da paleta para aceitar o valor
+DISTANCIA_MAX_COR = 20
+
+# Diferença máxima (cinza, grade reduzida 1/4) para um tile contar como igual
+# ao quadro anterior
+LIMIAR_DIFERENCA = 8
+
+# Faixa vazia entre os tiles no mosaico do Tesseract (px)
+MOSAICO_SEPARADOR = 32
+
+# Mínimo de pixels de texto no tile binarizado para não ser considerado vazio
+PIXELS_MIN_TEXTO = 40
+
+# Confiança mínima do classificador de tiles (abaixo disso o tile vai ao OCR)
+CONFIANCA_MIN_CLASSIFICADOR = 0.9
+
+# Cor de fundo da grade (faixas entre os tiles, #bbada0 em BGR) e tolerância
+# por canal usada na detecção por projeção
+FUNDO_GRADE = (160, 173, 187)
+TOLERANCIA_FUNDO = 10
+
+# Detecção de fim de animação (Sensor.aguardar_estabilidade), em segundos.
+# 3 quadros a cada 10 ms cobrem mais de um frame do navegador (~16 ms)
+ESTABILIDADE_TIMEOUT = 1.0
+ESTABILIDADE_INICIO = 0.1
+ESTABILIDADE_INTERVALO = 0.01
+ESTABILIDADE_QUADROS = 3
@@ -0,0 +1,121 @@
+import random
+
+import numpy as np
+from core import batch, bitboard
+
+
+class Game2048:
+    def __init__(self, seed: int | None = None) -> None:
+        """Jogo 2048 em memória, sem navegador, sobre o bitboard
+
+        Args:
+            seed (int | None, optional): Semente do gerador de tiles. Defaults to None.
+        """
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.reset()
+
+    def reset(self) -> None:
+        self.estado = 0
+        self.quatros = 0
+        self.moves = 0
+        self.spawn()
+        self.spawn()
+
+    def spawn(self) -> bool:
+        """Gera um 2 (90%) ou um 4 (10%) em uma célula vazia aleatória
+
+        Returns:
+            bool: False se não havia célula vazia
+        """
+        vazios = [i for i in range(16) if not (self.estado >> (4 * i)) & 0xF]
+        if not vazios:
+            return False
+        celula = self.rng.choice(vazios)
+        if self.rng.random() < bitboard.PROB_4:
+            self.estado |= 2 << (4 * celula)
+            self.quatros += 1
+        else:
+            self.estado |= 1 << (4 * celula)
+        return True
+
+    def step(self, direcao: str) -> bool:
+        """Aplica o movimento e gera o próximo tile
+
+        Args:
+            direcao (str): "up", "down", "left" ou "right"
+
+        Returns:
+            bool: False se o movimento era inválido (o jogo não muda)
+        """
+        novo = bitboard.move(self.estado, direcao)
+        if novo == self.estado:
+            return False
+        self.estado = novo
+        self.moves += 1
+        self.spawn()
+        return True
+
+    def is_over(self) -> bool:
+        return all(
+            mover(self.estado) == self.estado for mover in bitboard.MOVES.values()
+        )
+
+    @property
+    def board(self) -> np.ndarray:
+        return bitboard.decode(self.estado)
+
+    @property
+    def score(self) -> int:
+        return bitboard.score(self.estado, self.quatros)
+
+    @property
+    def max_tile(self) -> int:
+        return bitboard.max_tile(self.estado)
+
+
+class Game2048Lote:
+    def __init__(self, n: int, seed: int | None = None) -> None:
+        """N jogos 2048 avançando juntos, com os movimentos vetorizados
+
+        Args:
+            n (int): Quantidade de jogos
+            seed (int | None, optional): Semente do gerador. Defaults to None.
+        """
+        self.rng = np.random.default_rng(seed)
+        self.estados = np.zeros(n, dtype=np.uint64)
+        self.quatros = np.zeros(n, dtype=np.int64)
+        self.moves = np.zeros(n, dtype=np.int64)
+        for _ in range(2):
+            self._spawn(np.ones(n, dtype=bool))
+
+    def _spawn(self, idx: np.ndarray) -> None:
+        novos, quatro = batch.spawn_lote(self.estados[idx], self.rng)
+        self.estados[idx] = novos
+        self.quatros[idx] += quatro
+
+    def step(self, acoes: np.ndarray) -> np.ndarray:
+        """Aplica uma ação por jogo e gera o próximo tile nos que mudaram
+
+        Args:
+            acoes (np.ndarray): (N,) índices em batch.ACOES
+
+        Returns:
+            np.ndarray: Máscara dos movimentos válidos
+        """
+        novos, validos, _ = batch.mover_lote(self.estados, acoes)
+        self.estados[validos] = novos[validos]
+        self.moves += validos
+        self._spawn(validos)
+        return validos
+
+    def movimentos_validos(self) -> np.ndarray:
+        """(N, 4) máscara de quais ações mudam cada tabuleiro"""
+        return (batch.mover_todos(self.estados) != self.estados).T
+
+    def is_over(self) -> np.ndarray:
+        return ~self.movimentos_validos().any(axis=1)
+
+    @property
+    def scores(self) -> np.ndarray:
+        return batch.score(self.estados) - 4 * self.quatros
@@ -0,0 +1,172 @@
+"""Rede de N-tuplas: função de valor por consulta em tabelas, treinada por TD.
+
+Cada tupla é um grupo de 4 células do tabuleiro; seus 4 expoentes (nibbles)
+formam um índice de 16 bits em uma tabela de pesos. O valor de um tabuleiro é
+a soma dos pesos das 5 tuplas em cada uma das 8 simetrias (os pesos são
+compartilhados entre simetrias). Os pesos ficam em um .npy float32 de
+5 x 65536 (~1.3 MB), copiado para listas Python ao carregar (a consulta
+escalar em lista é bem mais rápida que em array).
+
+A rede aprende o valor dos afterstates (tabuleiro logo após o movimento,
+antes do tile novo): a soma esperada dos pontos até o fim da partida.
+"""
+
+from pathlib import Path
+
+import numpy as np
+from core import bitboard
+
+NTUPLE_PATH = Path("pesos") / "ntuple.npy"
+
+# Tuplas sobre o índice de célula 4 * linha + coluna:
+# linhas 0 e 1 e quadrados 2x2 do canto, da borda e do centro
+TUPLAS = (
+    (0, 1, 2, 3),
+    (4, 5, 6, 7),
+    (0, 1, 4, 5),
+    (1, 2, 5, 6),
+    (5, 6, 9, 10),
+)
+N_TUPLAS = len(TUPLAS)
+N_FEATURES = 8 * N_TUPLAS
+
+
+def indices(estado: int) -> tuple[int, int, int, int, int]:
+    """Índices das 5 tuplas de um bitboard (só deslocamentos e máscaras)"""
+    return (
+        estado & 0xFFFF,
+        (estado >> 16) & 0xFFFF,
+        (estado & 0xFF) | ((estado >> 8) & 0xFF00),
+        ((estado >> 4) & 0xFF) | ((estado >> 12) & 0xFF00),
+        ((estado >> 20) & 0xFF) | ((estado >> 28) & 0xFF00),
+    )
+
+
+class NTupleNetwork:
+    def __init__(
+        self, pesos: np.ndarray | None = None, path: Path | None = None
+    ) -> None:
+        """Rede de N-tuplas
+
+        Args:
+            pesos (np.ndarray | None, optional): Tabelas (N_TUPLAS, 65536).
+                Defaults to None (zeros).
+            path (Path | None, optional): Arquivo de origem dos pesos, usado
+                para recarregar a rede nos processos da busca paralela.
+                Defaults to None.
+        """
+        if pesos is None:
+            pesos = np.zeros((N_TUPLAS, 1 << 16), dtype=np.float32)
+        self.path = path
+        # Listas Python: a consulta escalar é bem mais rápida que em arrays
+        self.tabelas: list[list[float]] = [tabela.tolist() for tabela in pesos]
+        # Cópia em array para save()/média de modelos, refeita só após atualizar()
+        self._pesos: np.ndarray | None = np.asarray(pesos, dtype=np.float32)
+
+    @classmethod
+    def load(cls, path: Path = NTUPLE_PATH) -> "NTupleNetwork":
+        """Carrega os pesos salvos por save()
+
+        Raises:
+            FileNotFoundError: Se o arquivo não existir (rode train_ntuple.py)
+        """
+        path = Path(path)
+        if not path.exists():
+            raise FileNotFoundError(
+                f"Pesos da rede de N-tuplas não encontrados em {path}. "
+                "Rode train_ntuple.py para gerá-los."
+            )
+        pesos = np.load(path)
+        if pesos.shape != (N_TUPLAS, 1 << 16):
+            raise ValueError(f"Formato de pesos inválido em {path}: {pesos.shape}")
+        return cls(pesos, path)
+
+    @property
+    def pesos(self) -> np.ndarray:
+        if self._pesos is None:
+            self._pesos = np.array(self.tabelas, dtype=np.float32)
+        return self._pesos
+
+    def save(self, path: Path = NTUPLE_PATH) -> None:
+        """Grava os pesos em .npy (escrita atômica: temporário + rename)"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp = path.with_suffix(".tmp.npy")
+        np.save(temp, self.pesos)
+        temp.replace(path)
+        self.path = path
+
+    def avaliar(self, estado: int) -> float:
+        """Valor do tabuleiro: soma de 40 consultas (5 tuplas x 8 simetrias)"""
+        t0, t1, t2, t3, t4 = self.tabelas
+        total = 0.0
+        for b in bitboard.simetrias(estado):
+            total += (
+                t0[b & 0xFFFF]
+                + t1[(b >> 16) & 0xFFFF]
+                + t2[(b & 0xFF) | ((b >> 8) & 0xFF00)]
+                + t3[((b >> 4) & 0xFF) | ((b >> 12) & 0xFF00)]
+                + t4[((b >> 20) & 0xFF) | ((b >> 28) & 0xFF00)]
+            )
+        return total
+
+    def valor_perda(self) -> float:
+        """Valor para um tabuleiro perdido na busca: abaixo de qualquer
+        avaliação possível (menor peso de cada tabela nas 8 simetrias)"""
+        return 8 * sum(min(tabela) for tabela in self.tabelas) - 1.0
+
+    def atualizar(self, estado: int, delta: float) -> None:
+        """Soma delta a todos os pesos usados na avaliação do tabuleiro"""
+        tabelas = self.tabelas
+        self._pesos = None
+        for b in bitboard.simetrias(estado):
+            for tabela, indice in zip(tabelas, indices(b)):
+                tabela[indice] += delta
+
+    def melhor_afterstate(self, estado: int) -> tuple[str | None, int, float]:
+        """Movimento guloso: maximiza pontos imediatos + valor do afterstate
+
+        Returns:
+            tuple[str | None, int, float]: Movimento (None se não houver
+            válido), afterstate e valor estimado
+        """
+        melhor: tuple[str | None, int, float] = (None, estado, 0.0)
+        pontos = bitboard.score(estado)
+        for move, mover in bitboard.MOVES.items():
+            novo = mover(estado)
+            if novo == estado:
+                continue
+            valor = bitboard.score(novo) - pontos + self.avaliar(novo)
+            if melhor[0] is None or valor > melhor[2]:
+                melhor = (move, novo, valor)
+        return melhor
+
+    def treinar_partida(self, game, alpha: float) -> None:
+        """Joga uma partida gulosa atualizando a rede por TD(0) nos afterstates
+
+        V(s') += alpha * (r + V(s'') - V(s')), em que s'' é o próximo
+        afterstate escolhido e r os pontos do movimento seguinte; no fim da
+        partida o alvo é 0.
+
+        Args:
+            game (Game2048): Partida já iniciada (é jogada até o fim)
+            alpha (float): Taxa de aprendizado (dividida entre as features)
+        """
+        passo = alpha / N_FEATURES
+        anterior: int | None = None
+        while True:
+            move, afterstate, valor = self.melhor_afterstate(game.estado)
+            if anterior is not None:
+                alvo = valor if move is not None else 0.0
+                self.atualizar(anterior, passo * (alvo - self.avaliar(anterior)))
+            if move is None:
+                return
+            anterior = afterstate
+            game.step(move)
+
+    def __reduce__(self):
+        # Nos workers da busca paralela, reabre o arquivo em vez de serializar
+        # as tabelas inteiras
+        if self.path is not None:
+            return (type(self).load, (self.path,))
+        return (type(self), (self.pesos,))
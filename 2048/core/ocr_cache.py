@@ -0,0 +1,99 @@
+"""Cache do OCR dos tiles, com chave pelo hash perceptual da imagem binarizada.
+
+Os mesmos poucos tiles (2, 4, 8, ...) aparecem milhares de vezes por sessão;
+com o cache o OCR só roda na primeira vez que cada imagem aparece. As
+entradas ficam em um JSON entre execuções.
+"""
+
+import json
+from collections import OrderedDict
+from pathlib import Path
+
+import cv2
+import numpy as np
+from logger_config import logger
+
+OCR_CACHE_DIR = Path("cache")
+
+
+def phash(img: cv2.typing.MatLike) -> int:
+    """Hash perceptual de 64 bits (DCT 32x32, bloco 8x8 de baixa frequência
+    comparado com a mediana)
+
+    Args:
+        img (cv2.typing.MatLike): Imagem do tile em escala de cinza
+
+    Returns:
+        int: Hash
+    """
+    reduzida = cv2.resize(img, (32, 32), interpolation=cv2.INTER_AREA)
+    dct = cv2.dct(reduzida.astype(np.float32))[:8, :8]
+    bits = (dct > np.median(dct)).ravel()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def valor_valido(valor: int) -> bool:
+    """Só guarda leituras plausíveis (0 ou potência de 2), para um erro do OCR
+    não ficar salvo"""
+    return valor == 0 or (valor >= 2 and valor & (valor - 1) == 0)
+
+
+class OCRCache:
+    def __init__(self, path: Path | None = None, capacidade: int = 4096) -> None:
+        """Cache LRU hash perceptual -> valor do tile
+
+        Args:
+            path (Path | None, optional): Arquivo JSON de persistência.
+                Defaults to None (só em memória).
+            capacidade (int, optional): Máximo de entradas. Defaults to 4096.
+        """
+        self.path = path
+        self.capacidade = capacidade
+        self.tabela: OrderedDict[int, int] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.carregar()
+
+    def get(self, chave: int) -> int | None:
+        valor = self.tabela.get(chave)
+        if valor is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.tabela.move_to_end(chave)
+        return valor
+
+    def put(self, chave: int, valor: int) -> None:
+        self.tabela[chave] = valor
+        self.tabela.move_to_end(chave)
+        if len(self.tabela) > self.capacidade:
+            self.tabela.popitem(last=False)
+
+    def carregar(self) -> None:
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            entradas = json.loads(self.path.read_text())
+        except (OSError, ValueError) as e:
+            logger.warning(f"Cache de OCR ignorado ({self.path}): {e}")
+            return
+        for chave, valor in entradas.items():
+            self.put(int(chave, 16), valor)
+        logger.info(f"Cache de OCR carregado: {len(self.tabela)} tiles ({self.path})")
+
+    def salvar(self) -> None:
+        """Grava as entradas (da menos para a mais recente) de forma atômica"""
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp = self.path.with_suffix(".tmp")
+        temp.write_text(json.dumps({f"{k:016x}": v for k, v in self.tabela.items()}))
+        temp.replace(self.path)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def __len__(self) -> int:
+        return len(self.tabela)
@@ -0,0 +1,110 @@
+"""Política Monte Carlo: avalia cada movimento por partidas aleatórias em lote.
+
+Para cada movimento válido da raiz são jogadas K partidas aleatórias até a
+profundidade D. Todas as partidas (de todos os movimentos) avançam juntas
+com os movimentos vetorizados de core.batch.
+"""
+
+import threading
+import time
+
+import numpy as np
+from core import batch, bitboard
+
+
+class MonteCarlo:
+    def __init__(
+        self,
+        rollouts: int = 100,
+        depth: int = 20,
+        time_budget: float | None = None,
+        seed: int | None = None,
+    ) -> None:
+        """Política de rollouts aleatórios
+
+        Args:
+            rollouts (int, optional): Partidas por movimento em cada lote. Defaults to 100.
+            depth (int, optional): Movimentos por partida. Defaults to 20.
+            time_budget (float | None, optional): Tempo por movimento em
+                segundos. Se definido, joga lotes até o prazo. Defaults to None.
+            seed (int | None, optional): Semente do gerador. Defaults to None.
+        """
+        self.rollouts = rollouts
+        self.depth = depth
+        self.time_budget = time_budget
+        self.rng = np.random.default_rng(seed)
+        self.nodes = 0
+        self.depth_reached = 0
+        # Sinal para parar entre lotes (especulação descartada pelo Think)
+        self.cancelar: threading.Event | None = None
+
+    def best_move(self, estado: int) -> tuple[str | None, int | None]:
+        """Escolhe o movimento com maior pontuação média nas partidas aleatórias
+
+        Args:
+            estado (int): Bitboard atual
+
+        Returns:
+            tuple[str | None, int | None]: Movimento e bitboard resultante
+            (None, None se não houver movimento válido)
+        """
+        self.nodes = 0
+        self.depth_reached = self.depth
+
+        moves: list[str] = []
+        afterstates: list[int] = []
+        for move, mover in bitboard.MOVES.items():
+            novo = mover(estado)
+            if novo != estado:
+                moves.append(move)
+                afterstates.append(novo)
+        if not moves:
+            return None, None
+        if len(moves) == 1:
+            return moves[0], afterstates[0]
+
+        raizes = np.array(afterstates, dtype=np.uint64)
+        imediato = batch.score(raizes) - bitboard.score(estado)
+        soma = np.zeros(len(moves))
+        n = 0
+
+        deadline = None
+        if self.time_budget is not None:
+            deadline = time.monotonic() + self.time_budget
+        while True:
+            soma += self._jogar(raizes)
+            n += self.rollouts
+            if deadline is None or time.monotonic() > deadline:
+                break
+            if self.cancelar is not None and self.cancelar.is_set():
+                break
+
+        valores = imediato + soma / n
+        melhor = int(np.argmax(valores))
+        return moves[melhor], afterstates[melhor]
+
+    def _jogar(self, raizes: np.ndarray) -> np.ndarray:
+        """Joga um lote de partidas aleatórias a partir de cada raiz
+
+        Returns:
+            np.ndarray: Soma dos pontos obtidos nas partidas de cada raiz
+        """
+        estados = np.repeat(raizes, self.rollouts)
+        estados, _ = batch.spawn_lote(estados, self.rng)
+        inicio = batch.score(estados)
+        quatros = np.zeros(len(estados), dtype=np.int64)
+        indices = np.arange(len(estados))
+
+        for _ in range(self.depth):
+            todos = batch.mover_todos(estados)
+            validos = todos != estados
+            if not validos.any():
+                break
+            # Ação aleatória entre as válidas (tabuleiros perdidos ficam iguais)
+            escolha = (self.rng.random(validos.shape) * validos).argmax(axis=0)
+            estados, quatro = batch.spawn_lote(todos[escolha, indices], self.rng)
+            quatros += quatro
+            self.nodes += len(estados)
+
+        pontos = batch.score(estados) - inicio - 4 * quatros
+        return pontos.reshape(len(raizes), self.rollouts).sum(axis=1)
@@ -0,0 +1,492 @@
+"""Busca expectimax sobre o bitboard do 2048.
+
+Nós de máximo escolhem o melhor movimento e nós de acaso fazem a média
+ponderada sobre todos os tiles que podem surgir (2 com 90%, 4 com 10%).
+"""
+
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Callable
+
+from core import bitboard, heuristic
+from core.bitboard import PROB_2, PROB_4
+from core.cache import Entrada, TranspositionCache
+
+# Espaços de chave na tabela de transposição
+NO_ACASO = 0
+NO_RAIZ = 1
+# Nós de acaso rasos usam o próprio bitboard como chave: canonicalizar custa
+# mais do que as transposições que acharia. Como a chave canônica também é um
+# tabuleiro da mesma órbita, as duas formas convivem na mesma tabela.
+MIN_DEPTH_CANONICO = 2
+# Intervalo (s) em que a busca paralela confere o cancelamento enquanto espera
+INTERVALO_CANCELAMENTO = 0.01
+# Duração (s) da tarefa vazia de aquecimento: longa o bastante para cada
+# worker pegar uma, em vez de um só executar todas
+DURACAO_AQUECIMENTO = 0.05
+
+
+# Prazos usam time.monotonic() para valerem entre processos do pool
+
+
+class TempoEsgotado(Exception):
+    """Prazo da busca esgotado no meio de uma iteração"""
+
+
+class Expectimax:
+    MAX_DEPTH = 12
+
+    def __init__(
+        self,
+        depth: int = 3,
+        prob_cutoff: float = 1e-3,
+        avaliar: Callable[[int], float] = heuristic.avaliar,
+        time_budget: float | None = None,
+        cache_size: int = 200_000,
+        valor_perda: float = heuristic.VALOR_PERDA,
+        afterstates: bool = False,
+    ) -> None:
+        """Busca expectimax com tabela de transposição
+
+        Args:
+            depth (int, optional): Profundidade em movimentos. Defaults to 3.
+            prob_cutoff (float, optional): Probabilidade acumulada abaixo da
+                qual um nó de acaso é avaliado direto, sem expandir. Defaults to 1e-3.
+            avaliar (Callable[[int], float], optional): Avaliação das folhas.
+                Defaults to heuristic.avaliar.
+            time_budget (float | None, optional): Tempo por movimento em
+                segundos. Se definido, aprofunda iterativamente até o prazo
+                (ignorando ``depth``). Defaults to None.
+            cache_size (int, optional): Entradas da tabela de transposição,
+                que é mantida entre as jogadas da mesma partida. Defaults to 200_000.
+            valor_perda (float, optional): Valor de um tabuleiro sem movimento
+                válido; precisa ficar abaixo de qualquer avaliação de
+                tabuleiro vivo. Defaults to heuristic.VALOR_PERDA.
+            afterstates (bool, optional): ``avaliar`` estima os pontos futuros
+                a partir de um afterstate (rede de N-tuplas). Cada movimento
+                vale os pontos da junção mais o valor abaixo dele, e as folhas
+                são afterstates (depth 1 é a escolha gulosa do treino).
+                Defaults to False.
+        """
+        self.depth = depth
+        self.prob_cutoff = prob_cutoff
+        self.avaliar = avaliar
+        self.valor_perda = valor_perda
+        self.afterstates = afterstates
+        self.cache = TranspositionCache(cache_size)
+        self.nodes = 0
+        self.time_budget = time_budget
+        self.deadline: float | None = None
+        # Sinal para abandonar a busca (especulação descartada pelo Think)
+        self.cancelar: threading.Event | None = None
+        self.depth_reached = 0
+
+    def best_move(self, estado: int) -> tuple[str | None, int | None]:
+        """Escolhe o movimento com maior valor esperado
+
+        Args:
+            estado (int): Bitboard atual
+
+        Returns:
+            tuple[str | None, int | None]: Movimento e bitboard resultante
+            (None, None se não houver movimento válido)
+        """
+        self.nodes = 0
+
+        if self.time_budget is None:
+            self.depth_reached = self.depth
+            return self._raiz(estado, self.depth)
+
+        # Aprofundamento iterativo: a profundidade 1 sempre termina, as demais
+        # são abandonadas se o prazo acabar e vale a última completa
+        deadline = time.monotonic() + self.time_budget
+        melhor = self._raiz(estado, 1)
+        self.depth_reached = 1
+        self.deadline = deadline
+        try:
+            for depth in range(2, self.MAX_DEPTH + 1):
+                if melhor[0] is None:
+                    break
+                melhor = self._raiz(estado, depth)
+                self.depth_reached = depth
+        except TempoEsgotado:
+            pass
+        finally:
+            self.deadline = None
+        return melhor
+
+    def nova_partida(self) -> None:
+        """Descarta a tabela de transposição (ela vale só dentro de uma partida)"""
+        self.cache.clear()
+
+    def _interromper(self) -> bool:
+        """Prazo esgotado ou busca cancelada"""
+        if self.cancelar is not None and self.cancelar.is_set():
+            return True
+        return self.deadline is not None and time.monotonic() > self.deadline
+
+    def _raiz(self, estado: int, depth: int) -> tuple[str | None, int | None]:
+        entrada = self.cache.get(estado, NO_RAIZ)
+        if entrada is not None and entrada.depth >= depth and entrada.move:
+            return entrada.move, bitboard.move(estado, entrada.move)
+
+        melhor: tuple[str | None, int | None] = (None, None)
+        melhor_valor = float("-inf")
+        for move, mover in bitboard.MOVES.items():
+            novo = mover(estado)
+            if novo == estado:
+                continue
+            valor = self._movimento(estado, novo, depth, 1.0)
+            if valor > melhor_valor:
+                melhor_valor = valor
+                melhor = (move, novo)
+
+        if melhor[0] is not None:
+            self.cache.put(estado, depth, melhor_valor, melhor[0], NO_RAIZ)
+        return melhor
+
+    def _max(self, estado: int, depth: int, prob: float) -> float:
+        if depth == 0:
+            return self.avaliar(estado)
+
+        melhor = float("-inf")
+        for mover in bitboard.MOVES.values():
+            novo = mover(estado)
+            if novo != estado:
+                melhor = max(melhor, self._movimento(estado, novo, depth, prob))
+        # Sem movimento válido: perder vale menos que qualquer tabuleiro vivo
+        return melhor if melhor > float("-inf") else self.valor_perda
+
+    def _movimento(self, estado: int, novo: int, depth: int, prob: float) -> float:
+        """Valor de um movimento: o nó de acaso do afterstate ou, com
+        afterstates, os pontos da junção mais esse valor (na última
+        profundidade, o valor do próprio afterstate)"""
+        if not self.afterstates:
+            return self._chance(novo, depth, prob)
+        recompensa = bitboard.score(novo) - bitboard.score(estado)
+        if depth == 1:
+            self.nodes += 1
+            return recompensa + self.avaliar(novo)
+        return recompensa + self._chance(novo, depth, prob)
+
+    def _chance(self, estado: int, depth: int, prob: float) -> float:
+        self.nodes += 1
+        if not self.nodes & 0xFF and self._interromper():
+            raise TempoEsgotado
+        if prob < self.prob_cutoff:
+            return self.avaliar(estado)
+
+        if depth >= MIN_DEPTH_CANONICO:
+            chave = self.cache.chave(estado, NO_ACASO)
+        else:
+            chave = estado | (NO_ACASO << 64)
+        entrada = self.cache.lookup(chave)
+        if entrada is not None and entrada.depth >= depth:
+            return entrada.valor
+
+        vazios = [4 * i for i in range(16) if not (estado >> (4 * i)) & 0xF]
+        if not vazios:
+            return self._max(estado, depth - 1, prob)
+
+        prob_2 = prob * PROB_2 / len(vazios)
+        prob_4 = prob * PROB_4 / len(vazios)
+        total = 0.0
+        for shift in vazios:
+            total += PROB_2 * self._max(estado | (1 << shift), depth - 1, prob_2)
+            total += PROB_4 * self._max(estado | (2 << shift), depth - 1, prob_4)
+        valor = total / len(vazios)
+
+        self.cache.store(chave, Entrada(depth, valor, None))
+        return valor
+
+
+# Busca mantida por cada processo do pool (criada no initializer)
+_busca_worker: Expectimax | None = None
+_partida_worker = 0
+
+
+def _iniciar_worker(
+    avaliar: Callable[[int], float], valor_perda: float, afterstates: bool, cancelar
+) -> None:
+    global _busca_worker
+    _busca_worker = Expectimax(
+        avaliar=avaliar, valor_perda=valor_perda, afterstates=afterstates
+    )
+    # Sinal compartilhado com o processo principal: para as tarefas em execução
+    _busca_worker.cancelar = cancelar
+
+
+def _aquecer_worker(duracao: float) -> int:
+    """Tarefa vazia: só garante que o processo já subiu e rodou o initializer"""
+    time.sleep(duracao)
+    return os.getpid()
+
+
+def _avaliar_filho(
+    partida: int,
+    filho: int,
+    depth: int,
+    prob: float,
+    prob_cutoff: float,
+    deadline: float | None,
+) -> tuple[float | None, int, int, int]:
+    """Avalia, dentro de um worker, o nó de máximo abaixo de um tile sorteado
+
+    Returns:
+        tuple[float | None, int, int, int]: Valor (None se o prazo acabou ou a
+        busca foi cancelada), nós visitados e hits/misses da tabela do worker
+    """
+    global _partida_worker
+    busca = _busca_worker
+    # Tarefa que saiu da fila depois do prazo (ou do cancelamento) nem começa
+    if busca._interromper() or (deadline is not None and time.monotonic() > deadline):
+        return None, 0, 0, 0
+    # A tabela de transposição do worker vale até a próxima partida
+    if partida != _partida_worker:
+        busca.nova_partida()
+        _partida_worker = partida
+    busca.nodes = 0
+    busca.prob_cutoff = prob_cutoff
+    busca.deadline = deadline
+    hits, misses = busca.cache.hits, busca.cache.misses
+    valor = None
+    try:
+        valor = busca._max(filho, depth, prob)
+    except TempoEsgotado:
+        pass
+    finally:
+        busca.deadline = None
+    return (
+        valor,
+        busca.nodes,
+        busca.cache.hits - hits,
+        busca.cache.misses - misses,
+    )
+
+
+class ExpectimaxParalelo(Expectimax):
+    def __init__(
+        self,
+        depth: int = 3,
+        prob_cutoff: float = 1e-3,
+        avaliar: Callable[[int], float] = heuristic.avaliar,
+        time_budget: float | None = None,
+        workers: int | None = None,
+        valor_perda: float = heuristic.VALOR_PERDA,
+        afterstates: bool = False,
+        contexto: str | None = None,
+    ) -> None:
+        """Expectimax que distribui as subárvores da raiz em um pool de processos
+
+        Cada tarefa é o nó de máximo abaixo de um (movimento, tile sorteado) da
+        raiz, o que gera dezenas de tarefas por jogada e equilibra a carga entre
+        os núcleos. O pool é criado uma única vez e reaproveitado entre jogadas.
+        No Windows o script principal precisa do guarda ``if __name__ == "__main__"``.
+        Chame aquecer() antes da primeira jogada, para a subida dos processos
+        não contar no time_budget dela.
+
+        Args:
+            workers (int | None, optional): Número de processos.
+                Defaults to os.cpu_count().
+            contexto (str | None, optional): Método de início dos processos
+                ("spawn", "fork", ...). Defaults to None (padrão do sistema).
+        """
+        super().__init__(
+            depth,
+            prob_cutoff,
+            avaliar,
+            time_budget,
+            valor_perda=valor_perda,
+            afterstates=afterstates,
+        )
+        self.workers = workers or os.cpu_count() or 1
+        self.pool: ProcessPoolExecutor | None = None
+        self.contexto = multiprocessing.get_context(contexto)
+        # Sinal que os workers conferem durante a busca (ver _cancelar_tarefas)
+        self.parar_workers = self.contexto.Event()
+        self.partida = 0
+
+    def nova_partida(self) -> None:
+        super().nova_partida()
+        # Os workers limpam as próprias tabelas ao ver outro número de partida
+        self.partida += 1
+
+    def get_pool(self) -> ProcessPoolExecutor:
+        if self.pool is None:
+            self.pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=self.contexto,
+                initializer=_iniciar_worker,
+                initargs=(
+                    self.avaliar,
+                    self.valor_perda,
+                    self.afterstates,
+                    self.parar_workers,
+                ),
+            )
+        return self.pool
+
+    def aquecer(self) -> None:
+        """Cria o pool e espera os workers subirem (uma tarefa vazia por worker)"""
+        pool = self.get_pool()
+        futuros = [
+            pool.submit(_aquecer_worker, DURACAO_AQUECIMENTO)
+            for _ in range(self.workers)
+        ]
+        wait(futuros)
+
+    def best_move(self, estado: int) -> tuple[str | None, int | None]:
+        self.nodes = 0
+        self.depth_reached = 0
+
+        # Tarefas: (movimento, peso, filho, probabilidade acumulada)
+        resultados: dict[str, int] = {}
+        tarefas: list[tuple[str, float, int, float]] = []
+        for move, mover in bitboard.MOVES.items():
+            novo = mover(estado)
+            if novo == estado:
+                continue
+            resultados[move] = novo
+            vazios = [4 * i for i in range(16) if not (novo >> (4 * i)) & 0xF]
+            for shift in vazios:
+                n = len(vazios)
+                tarefas.append((move, PROB_2 / n, novo | (1 << shift), PROB_2 / n))
+                tarefas.append((move, PROB_4 / n, novo | (2 << shift), PROB_4 / n))
+
+        if not resultados:
+            return None, None
+
+        if self.time_budget is None:
+            valores = self._iteracao(estado, resultados, tarefas, self.depth, None)
+            self.depth_reached = self.depth
+        else:
+            deadline = time.monotonic() + self.time_budget
+            valores = self._iteracao(estado, resultados, tarefas, 1, deadline)
+            self.depth_reached = 1
+            if valores is None:
+                # Nem a profundidade 1 voltou a tempo (pool ainda subindo):
+                # resolve aqui mesmo, sem o pool
+                return self._raiz(estado, 1)
+            for depth in range(2, self.MAX_DEPTH + 1):
+                parcial = self._iteracao(estado, resultados, tarefas, depth, deadline)
+                if parcial is None:
+                    break
+                valores = parcial
+                self.depth_reached = depth
+
+        move = max(valores, key=valores.get)
+        return move, resultados[move]
+
+    def _iteracao(
+        self,
+        estado: int,
+        resultados: dict[str, int],
+        tarefas: list[tuple[str, float, int, float]],
+        depth: int,
+        deadline: float | None,
+    ) -> dict[str, float] | None:
+        """Valor de cada movimento da raiz em uma profundidade (None se o
+        prazo acabou); com afterstates, soma os pontos da junção de cada um"""
+        if self.afterstates and depth == 1:
+            # Folha no próprio afterstate, sem passar pelo pool
+            self.nodes += len(resultados)
+            valores = {move: self.avaliar(novo) for move, novo in resultados.items()}
+        else:
+            valores = self._rodar(tarefas, depth, deadline)
+            if valores is None:
+                return None
+        if self.afterstates:
+            pontos = bitboard.score(estado)
+            for move, novo in resultados.items():
+                valores[move] += bitboard.score(novo) - pontos
+        return valores
+
+    def _rodar(
+        self,
+        tarefas: list[tuple[str, float, int, float]],
+        depth: int,
+        deadline: float | None,
+    ) -> dict[str, float] | None:
+        """Avalia todas as tarefas em uma profundidade
+
+        Espera as tarefas conforme terminam e confere o cancelamento a cada
+        INTERVALO_CANCELAMENTO, sem ficar preso no resultado de uma só.
+
+        Raises:
+            TempoEsgotado: Busca cancelada (especulação descartada)
+
+        Returns:
+            dict[str, float] | None: Valor esperado de cada movimento, ou None
+            se alguma tarefa não terminou antes do prazo
+        """
+        pool = self.get_pool()
+        futuros = [
+            pool.submit(
+                _avaliar_filho,
+                self.partida,
+                filho,
+                depth - 1,
+                prob,
+                self.prob_cutoff,
+                deadline,
+            )
+            for _, _, filho, prob in tarefas
+        ]
+
+        indices = {futuro: i for i, futuro in enumerate(futuros)}
+        resultados: list[float] = [0.0] * len(futuros)
+        pendentes = set(futuros)
+        while pendentes:
+            prontos, pendentes = wait(
+                pendentes, timeout=INTERVALO_CANCELAMENTO, return_when=FIRST_COMPLETED
+            )
+            if self.cancelar is not None and self.cancelar.is_set():
+                self._cancelar_tarefas(futuros)
+                raise TempoEsgotado
+            if deadline is not None and time.monotonic() > deadline and pendentes:
+                # Prazo esgotado sem resposta (ex.: pool ainda subindo): não
+                # espera as tarefas, que param sozinhas no mesmo prazo
+                for pendente in pendentes:
+                    pendente.cancel()
+                return None
+            for futuro in prontos:
+                valor, nodes, hits, misses = futuro.result()
+                self.nodes += nodes
+                # Consultas às tabelas dos workers contam na desta busca
+                self.cache.hits += hits
+                self.cache.misses += misses
+                if valor is None:
+                    # Profundidade incompleta: descarta as tarefas ainda na fila
+                    # (as que já rodam param sozinhas no mesmo prazo)
+                    for pendente in pendentes:
+                        pendente.cancel()
+                    return None
+                resultados[indices[futuro]] = valor
+
+        # Soma na ordem das tarefas, independente da ordem em que terminaram
+        valores: dict[str, float] = {}
+        for (move, peso, _, _), valor in zip(tarefas, resultados):
+            valores[move] = valores.get(move, 0.0) + peso * valor
+        return valores
+
+    def _cancelar_tarefas(self, futuros: list) -> None:
+        """Descarta as tarefas na fila e interrompe as que já rodam nos workers
+
+        Espera as tarefas em execução devolverem (na próxima conferência do
+        sinal, a cada 256 nós) antes de liberar o pool para a próxima busca.
+        """
+        for futuro in futuros:
+            futuro.cancel()
+        self.parar_workers.set()
+        try:
+            wait(futuros)
+        finally:
+            self.parar_workers.clear()
+
+    def close(self) -> None:
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+            self.pool = None
@@ -1,18 +1,44 @@
+import time
 from concurrent.futures import ThreadPoolExecutor
 from enum import Enum, auto
 from pathlib import Path
 from typing import NamedTuple
 
 import cv2
-import easyocr
 import mss
 import numpy as np
 import pygetwindow as gw
 import pytesseract
 from core import debug
-from core.constants import BLUE, GREEN, RED, TILE_SIZE
+from core.classificador import ClassificadorTiles, salvar_exemplo
+from core.constants import (
+    BLUE,
+    CONFIANCA_MIN_CLASSIFICADOR,
+    DISTANCIA_MAX_COR,
+    ESTABILIDADE_INICIO,
+    ESTABILIDADE_INTERVALO,
+    ESTABILIDADE_QUADROS,
+    ESTABILIDADE_TIMEOUT,
+    FUNDO_GRADE,
+    GREEN,
+    LIMIAR_DIFERENCA,
+    MOSAICO_SEPARADOR,
+    PALETA_TILES,
+    PIXELS_MIN_TEXTO,
+    RED,
+    TILE_SIZE,
+    TOLERANCIA_FUNDO,
+)
+from core.ocr_cache import OCR_CACHE_DIR, OCRCache, phash, valor_valido
 from logger_config import logger
 
+from compartilhado import modelos
+from compartilhado.calibracao import Calibracao
+
+# Paleta em arrays para a busca vetorizada da cor mais próxima
+PALETA_VALORES = np.array(list(PALETA_TILES), dtype=int)
+PALETA_BGR = np.array(list(PALETA_TILES.values()), dtype=float)
+
 
 # Tipos
 class Tile(NamedTuple):
@@ -27,6 +53,10 @@ class OCRMethod(Enum):
     EASYOCR = auto()
     TESSERACT_THREAD = auto()
     EASYOCR_THREAD = auto()
+    TESSERACT_MOSAICO = auto()  # Uma chamada para todos os tiles
+    EASYOCR_RECONHECEDOR = auto()  # Sem o detector de texto
+    CLASSIFICADOR = auto()  # Classificador treinado, OCR só nos incertos
+    COR = auto()  # Cor de fundo do tile (OCR só para cores desconhecidas)
 
 
 class GradeMethod(Enum):
@@ -34,6 +64,8 @@ class GradeMethod(Enum):
     CANNY_FIXED = auto()
     COR = auto()
     COR_FIXED = auto()
+    PROJECAO = auto()
+    PROJECAO_FIXED = auto()
 
 
 # Classe Principal
@@ -45,16 +77,44 @@ class Sensor:
         window_name: str,
         ocr_method: OCRMethod = OCRMethod.EASYOCR,
         grade_method: GradeMethod = GradeMethod.CANNY,
+        ocr_cache: bool = False,
+        diferenca_quadros: bool = False,
+        registrar_tiles: bool = False,
     ):
         self.region = self.get_window(window_name)
         self.grade_region = None
+        self.score_region: dict[str, int] | None = None
+        self.templates: dict[str, cv2.typing.MatLike] = {}
         self.fixed = "FIXED" in grade_method.name
         self.fixed_tiles = None
         self.sct = mss.mss()
-        self.reader = easyocr.Reader(["pt"])
         self.margem = 0 if self.fixed else 20
         self.ocr_method = ocr_method
         self.grade_method = grade_method
+        # Um arquivo por método, para não misturar leituras no benchmark
+        self.ocr_cache = (
+            OCRCache(OCR_CACHE_DIR / f"ocr_{ocr_method.name.lower()}.json")
+            if ocr_cache
+            else None
+        )
+        # Tiles lidos pelo OCR viram exemplos para o classificador
+        self.registrar_tiles = registrar_tiles
+        self.classificador = None
+        if ocr_method == OCRMethod.CLASSIFICADOR:
+            try:
+                self.classificador = ClassificadorTiles.load()
+            except FileNotFoundError as e:
+                logger.warning(f"{e} Usando só o OCR.")
+        # Quadro anterior: só relê os tiles cujos pixels mudaram
+        self.diferenca_quadros = diferenca_quadros
+        self.grade_anterior: cv2.typing.MatLike | None = None
+        self.tiles_anteriores: list[Tile] | None = None
+        self.valores_anteriores: np.ndarray | None = None
+        # Grade calibrada em execuções anteriores (validada no primeiro quadro)
+        self.calibracao = Calibracao("2048", self.region)
+        self.chave_grade = f"grade_{grade_method.name}"
+        self.tiles_calibrados: list[Tile] | None = None
+        self._restaurar_calibracao()
 
         # Métodos e técnicas
         self.ler_texto = {
@@ -62,14 +122,25 @@ class Sensor:
             OCRMethod.TESSERACT: self._ocr_tesseract,
             OCRMethod.TESSERACT_THREAD: self._ocr_tesseract_parallel,
             OCRMethod.EASYOCR_THREAD: self._ocr_easyocr_parallel,
+            OCRMethod.TESSERACT_MOSAICO: self._ocr_tesseract_mosaico,
+            OCRMethod.EASYOCR_RECONHECEDOR: self._ocr_easyocr_reconhecedor,
+            OCRMethod.CLASSIFICADOR: self._ocr_easyocr_parallel,  # Tiles incertos
+            OCRMethod.COR: self._ocr_easyocr,  # Fallback das cores desconhecidas
         }.get(ocr_method, self._ocr_easyocr)
         self.detectar_grade = {
             GradeMethod.CANNY: self._detectar_grade_canny_edge,
             GradeMethod.COR: self._detectar_grade_cor,
             GradeMethod.CANNY_FIXED: self._detectar_grade_canny_edge,
             GradeMethod.COR_FIXED: self._detectar_grade_cor,
+            GradeMethod.PROJECAO: self._detectar_grade_projecao,
+            GradeMethod.PROJECAO_FIXED: self._detectar_grade_projecao,
         }.get(grade_method, self._detectar_grade_canny_edge)
 
+    @property
+    def reader(self):
+        """Leitor do EasyOCR compartilhado, carregado só quando algum método o usa"""
+        return modelos.easyocr_reader(["pt"])
+
     def get_window(self, window_name: str) -> dict[str, int]:
         """Retorna a região da janela
 
@@ -108,16 +179,72 @@ class Sensor:
         img = np.array(self.sct.grab(region if region else self.region))
         return cv2.cvtColor(img, cv2.COLOR_BGRA2BGR)
 
-    def get_grid(self) -> np.ndarray[tuple[int, int], np.dtype[np.int64]]:
+    def aguardar_estabilidade(
+        self,
+        timeout: float = ESTABILIDADE_TIMEOUT,
+        quadros: int = ESTABILIDADE_QUADROS,
+    ) -> float:
+        """Espera a animação do tabuleiro terminar (substitui o sleep fixo)
+
+        Captura só a região da grade (ou a janela, antes de detectá-la) em
+        intervalos curtos. Primeiro espera o quadro mudar em relação ao
+        inicial (a animação começou) por até ESTABILIDADE_INICIO; depois
+        declara estável quando `quadros` capturas seguidas são iguais.
+
+        Args:
+            timeout (float, optional): Espera máxima em segundos.
+                Defaults to ESTABILIDADE_TIMEOUT.
+            quadros (int, optional): Capturas iguais seguidas.
+                Defaults to ESTABILIDADE_QUADROS.
+
+        Returns:
+            float: Tempo até estabilizar (latência da animação), em segundos
+        """
+        inicio = time.perf_counter()
+        region = self.grade_region or self.region
+        referencia = anterior = self.get_screenshot(region)
+        comecou = False
+        iguais = 0
+        while (decorrido := time.perf_counter() - inicio) < timeout:
+            time.sleep(ESTABILIDADE_INTERVALO)
+            atual = self.get_screenshot(region)
+            comecou = (
+                comecou
+                or decorrido > ESTABILIDADE_INICIO
+                or not self._quadros_iguais(atual, referencia)
+            )
+            iguais = iguais + 1 if self._quadros_iguais(atual, anterior) else 0
+            anterior = atual
+            if comecou and iguais >= quadros - 1:
+                return time.perf_counter() - inicio
+
+        logger.debug(f"Tabuleiro não estabilizou em {timeout}s")
+        return time.perf_counter() - inicio
+
+    @staticmethod
+    def _quadros_iguais(a: cv2.typing.MatLike, b: cv2.typing.MatLike) -> bool:
+        return a.shape == b.shape and cv2.norm(a, b, cv2.NORM_INF) <= LIMIAR_DIFERENCA
+
+    def get_grid(
+        self, previsto: np.ndarray | None = None
+    ) -> np.ndarray[tuple[int, int], np.dtype[np.int64]]:
         """Obtém a matriz com os valores dos tiles
 
+        Args:
+            previsto (np.ndarray | None, optional): Tabuleiro esperado após o
+                último movimento (sem o tile novo). Se informado, só as células
+                vazias são verificadas. Defaults to None.
+
         Returns:
             np.ndarray[tuple[int, int], np.dtype[np.int64]]: Matriz
         """
+        if self.tiles_calibrados is not None:
+            self._conferir_calibracao()
+
         # Se for FIXED e já detectou uma vez, só reutiliza
         if self.fixed and self.fixed_tiles:
             grade = self.get_screenshot(self.grade_region)
-            return self._extrair_tiles(grade, self.fixed_tiles)
+            return self._extrair_tiles(grade, self.fixed_tiles, previsto)
 
         # Caso contrário, detecta normalmente
         grade, tiles = self.detectar_grade()
@@ -125,8 +252,112 @@ class Sensor:
 
         if self.fixed:
             self.fixed_tiles = tiles
+        if self.calibracao.get(self.chave_grade) is None:
+            self._salvar_calibracao(tiles)
+
+        return self._extrair_tiles(grade, tiles, previsto)
+
+    def _restaurar_calibracao(self) -> None:
+        """Carrega a região da grade (e os tiles, nos métodos FIXED) calibrados"""
+        salvo = self.calibracao.get(self.chave_grade)
+        if not salvo:
+            return
+        top, left, width, height = salvo["region"]
+        self.grade_region = {
+            "top": self.region["top"] + top,
+            "left": self.region["left"] + left,
+            "width": width,
+            "height": height,
+        }
+        self.tiles_calibrados = [Tile(*t) for t in salvo["tiles"]]
+        if self.fixed:
+            self.fixed_tiles = self.tiles_calibrados
+
+    def _salvar_calibracao(self, tiles: list[Tile]) -> None:
+        """Salva a região da grade e os tiles relativos ao recorte dela
+
+        Os detectores devolvem os tiles relativos ao tabuleiro, mas CANNY e
+        PROJECAO guardam a região com `self.margem` em volta. Os tiles são
+        deslocados para o recorte que será capturado na próxima execução e
+        conferidos nele antes de salvar.
+
+        Args:
+            tiles (list[Tile]): Tiles relativos ao tabuleiro, em ordem de linha
+        """
+        margem = (
+            0
+            if self.grade_method in (GradeMethod.COR, GradeMethod.COR_FIXED)
+            else self.margem
+        )
+        tiles = [Tile(t.x + margem, t.y + margem, t.w, t.h) for t in tiles]
+        if not self._validar_grade(self.get_screenshot(self.grade_region), tiles):
+            logger.debug("Grade não confere com o recorte, calibração não salva")
+            return
+        r = self.grade_region
+        self.calibracao.set(
+            self.chave_grade,
+            {
+                "region": [
+                    r["top"] - self.region["top"],
+                    r["left"] - self.region["left"],
+                    r["width"],
+                    r["height"],
+                ],
+                "tiles": tiles,
+            },
+        )
+
+    def _conferir_calibracao(self) -> None:
+        """Valida a calibração em um quadro; se não confere, volta à detecção"""
+        tiles, self.tiles_calibrados = self.tiles_calibrados, None
+        if self._validar_grade(self.get_screenshot(self.grade_region), tiles):
+            logger.info("Calibração da grade reutilizada")
+            return
+        logger.warning("Calibração da grade não confere, detectando novamente")
+        self.grade_region = None
+        self.fixed_tiles = None
+        self.calibracao.remover(self.chave_grade)
 
-        return self._extrair_tiles(grade, tiles)
+    def _validar_grade(self, screenshot: cv2.typing.MatLike, tiles: list[Tile]) -> bool:
+        """Confere a grade calibrada amostrando a própria rede de tiles salva
+
+        O centro de cada tile não pode ter a cor do fundo e o vão entre tiles
+        vizinhos precisa ter. Só usa as posições salvas, então vale para o
+        recorte de qualquer GradeMethod (com ou sem a borda do tabuleiro).
+
+        Args:
+            screenshot (cv2.typing.MatLike): Captura da região da grade
+            tiles (list[Tile]): Tiles calibrados, em ordem de linha
+
+        Returns:
+            bool: True se a geometria confere
+        """
+        if len(tiles) != 16:
+            return False
+        altura, largura = screenshot.shape[:2]
+
+        def fundo(x: int, y: int) -> bool | None:
+            if not (0 <= x < largura and 0 <= y < altura):
+                return None
+            diferenca = np.abs(
+                screenshot[y, x].astype(np.int16) - np.array(FUNDO_GRADE)
+            )
+            return bool(np.all(diferenca <= TOLERANCIA_FUNDO))
+
+        for i, t in enumerate(tiles):
+            cx, cy = t.x + t.w // 2, t.y + t.h // 2
+            if fundo(cx, cy) is not False:
+                return False
+            # Vão até o vizinho da direita e até o de baixo
+            if i % 4 < 3:
+                vizinho = tiles[i + 1]
+                if fundo((t.x + t.w + vizinho.x) // 2, cy) is not True:
+                    return False
+            if i < 12:
+                vizinho = tiles[i + 4]
+                if fundo(cx, (t.y + t.h + vizinho.y) // 2) is not True:
+                    return False
+        return True
 
     def match_template(
         self, template_name: str, threshold: float = 0.8
@@ -141,15 +372,11 @@ class Sensor:
             tuple[int, int] | None: Coordenadas clicadas ou None se não encontrado.
         """
         screenshot = self.get_screenshot()
-        template = cv2.imread(
-            str(self.TEMPLATES_DIR / f"{template_name}.png"), cv2.IMREAD_COLOR
-        )
-
-        if template is None:
-            raise FileNotFoundError(f"Template não encontrado: {template_name}")
+        template = self._carregar_template(template_name)
 
-        result = cv2.matchTemplate(screenshot, template, cv2.TM_CCOEFF_NORMED)
-        _, max_val, _, max_loc = cv2.minMaxLoc(result)
+        max_val, max_loc = self.calibracao.localizar_template(
+            screenshot, template, template_name, threshold
+        )
 
         if max_val >= threshold:
             template_h, template_w = template.shape[:2]
@@ -162,30 +389,66 @@ class Sensor:
     def extrair_score(self) -> int:
         """Extrai o score do jogo
 
+        Captura só a ROI do score já localizada; o template só é procurado de
+        novo quando a ROI não tem mais o quadro do score.
+
         Returns:
-            int: Score
+            int: Score (-1 se não foi possível ler)
         """
-        screenshot = self.get_screenshot()
+        for _ in range(2):
+            if self.score_region is None and not self._localizar_score():
+                return -1
+            numero = self._recortar_score(self.get_screenshot(self.score_region))
+            if numero is not None:
+                break
+            logger.debug("ROI do score não confere, procurando o template de novo")
+            self.score_region = None
+        else:
+            return -1
+
+        valor = self._ler_numero(numero)
+        if valor < 0:
+            logger.error("Não foi possível extrair score via OCR.")
+        return valor
+
+    def _localizar_score(self) -> bool:
+        """Procura o template "score" e guarda a ROI do número logo abaixo
 
-        # Carrega template "score"
-        template = cv2.imread(str(self.TEMPLATES_DIR / "score.png"), cv2.IMREAD_COLOR)
+        Returns:
+            bool: False se o template não foi encontrado
+        """
+        screenshot = self.get_screenshot()
+        template = self._carregar_template("score")
         h, w = template.shape[:2]
 
         # Aplica template matching
-        result = cv2.matchTemplate(screenshot, template, cv2.TM_CCOEFF_NORMED)
-        _, max_val, _, max_loc = cv2.minMaxLoc(result)
+        max_val, max_loc = self.calibracao.localizar_template(
+            screenshot, template, "score"
+        )
         if max_val < 0.8:
             logger.warning(f"Template 'score' não encontrado - {max_val}")
-            return -1
+            return False
 
         # Calcula coordenadas da ROI abaixo do template
         x, y = max_loc
-        roi_y = y + h - 5
-        roi_h = 35
-        roi_w = w + 30
-        roi_x = x - 15
+        self.score_region = {
+            "top": self.region["top"] + y + h - 5,
+            "left": self.region["left"] + x - 15,
+            "width": w + 30,
+            "height": 35,
+        }
+        return True
+
+    def _recortar_score(self, roi: cv2.typing.MatLike) -> cv2.typing.MatLike | None:
+        """Recorta e binariza o número dentro do quadro do score
 
-        roi = screenshot[roi_y : roi_y + roi_h, roi_x : roi_x + roi_w]
+        Args:
+            roi (cv2.typing.MatLike): Captura da ROI do score
+
+        Returns:
+            cv2.typing.MatLike | None: Número em branco sobre preto (ampliado),
+            ou None se a ROI não contém o quadro do score
+        """
         gray = cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY)
         _, thresh_light = cv2.threshold(gray, 240, 255, cv2.THRESH_BINARY)
         cv2.bitwise_not(thresh_light, thresh_light)
@@ -194,31 +457,71 @@ class Sensor:
         )
 
         # Encontra o maior contorno (deve ser o quadrado do número)
-        if contours:
-            largest_contour = max(contours, key=cv2.contourArea)
-            x, y, w, h = cv2.boundingRect(largest_contour)
-
-            # Recorta só a área escura (onde está o número)
-            number_area = thresh_light[y : y + h, x : x + w]
-            cv2.bitwise_not(number_area, number_area)
-
-            scale_factor = 4
-            resized = cv2.resize(
-                number_area,
-                None,
-                fx=scale_factor,
-                fy=scale_factor,
-                interpolation=cv2.INTER_CUBIC,
+        if not contours:
+            return None
+        largest_contour = max(contours, key=cv2.contourArea)
+        x, y, w, h = cv2.boundingRect(largest_contour)
+        if w * h < 0.3 * roi.shape[0] * roi.shape[1]:
+            return None
+
+        # Recorta só a área escura (onde está o número)
+        number_area = thresh_light[y : y + h, x : x + w]
+        cv2.bitwise_not(number_area, number_area)
+
+        scale_factor = 4
+        resized = cv2.resize(
+            number_area,
+            None,
+            fx=scale_factor,
+            fy=scale_factor,
+            interpolation=cv2.INTER_CUBIC,
+        )
+        debug.save_image(resized, "score_clean")
+        return resized
+
+    def _ler_numero(self, img: cv2.typing.MatLike) -> int:
+        """Lê um número com o mesmo backend dos tiles, sem detector de texto
+
+        Args:
+            img (cv2.typing.MatLike): Número binarizado (caixa já conhecida)
+
+        Returns:
+            int: Valor lido (-1 se não há dígitos)
+        """
+        if self.ocr_method in (
+            OCRMethod.TESSERACT,
+            OCRMethod.TESSERACT_THREAD,
+            OCRMethod.TESSERACT_MOSAICO,
+        ):
+            config = "--psm 7 --oem 3 -c tessedit_char_whitelist=0123456789"
+            texto = pytesseract.image_to_string(img, config=config).strip()
+        else:
+            h, w = img.shape[:2]
+            texto = "".join(
+                self.reader.recognize(
+                    img,
+                    horizontal_list=[[0, w, 0, h]],
+                    free_list=[],
+                    allowlist="0123456789",
+                    detail=0,
+                )
             )
-            debug.save_image(resized, "score_clean")
+        return int(texto) if texto.isdigit() else -1
 
-        # Faz OCR somente na ROI
-        result = self.reader.readtext(resized, detail=0, paragraph=False)
-        if result:
-            return int(result[0])
+    def _carregar_template(self, template_name: str) -> cv2.typing.MatLike:
+        """Lê o template do disco uma única vez
 
-        logger.error("Não foi possível extrair score via OCR.")
-        return -1
+        Raises:
+            FileNotFoundError: Template não encontrado
+        """
+        if template_name not in self.templates:
+            template = cv2.imread(
+                str(self.TEMPLATES_DIR / f"{template_name}.png"), cv2.IMREAD_COLOR
+            )
+            if template is None:
+                raise FileNotFoundError(f"Template não encontrado: {template_name}")
+            self.templates[template_name] = template
+        return self.templates[template_name]
 
     def _detectar_grade_cor(self) -> tuple[cv2.typing.MatLike, list[Tile]]:
         """Detecta a grade e os tiles usando a segmentação por cor
@@ -381,6 +684,101 @@ class Sensor:
 
         return grade, tiles
 
+    def _detectar_grade_projecao(self) -> tuple[cv2.typing.MatLike, list[Tile]]:
+        """Detecta a grade e os tiles pelas projeções do fundo do tabuleiro
+
+        Marca os pixels com a cor de fundo da grade (as faixas entre os tiles)
+        e soma a máscara por linha e por coluna: as faixas entre tiles ficam
+        com quase toda a altura/largura marcada e os tiles não. Não depende
+        da cor (nem do brilho) dos tiles.
+
+        Raises:
+            ValueError: Caso não seja possível detectar a grade
+
+        Returns:
+            tuple[cv2.typing.MatLike, list[Tile]]: Imagem da grade e os tiles
+        """
+        screenshot = self.get_screenshot(self.grade_region)
+        debug.save_image(screenshot, "screenshot")
+        (x_min, y_min, x_max, y_max), tiles = self._projetar_grade(screenshot)
+
+        # Salva a região da grade para screenshots futuras
+        if not self.grade_region:
+            self.grade_region = {
+                "top": self.region["top"] + y_min - self.margem,
+                "left": self.region["left"] + x_min - self.margem,
+                "width": x_max - x_min + 2 * self.margem,
+                "height": y_max - y_min + 2 * self.margem,
+            }
+
+        grade = screenshot[y_min:y_max, x_min:x_max]
+        debug.save_image(grade, "grade")
+        return grade, tiles
+
+    def _projetar_grade(
+        self, screenshot: cv2.typing.MatLike
+    ) -> tuple[tuple[int, int, int, int], list[Tile]]:
+        """Limites do tabuleiro e tiles (relativos a ele) pelas projeções do fundo
+
+        Args:
+            screenshot (cv2.typing.MatLike): Imagem que contém o tabuleiro
+
+        Raises:
+            ValueError: Caso não encontre o fundo ou a grade 4x4
+
+        Returns:
+            tuple[tuple[int, int, int, int], list[Tile]]: (x_min, y_min, x_max,
+            y_max) na imagem e os tiles
+        """
+        diferenca = np.abs(screenshot.astype(np.int16) - np.array(FUNDO_GRADE))
+        mask = np.all(diferenca <= TOLERANCIA_FUNDO, axis=2)
+        debug.save_image(mask.astype(np.uint8) * 255, "mask fundo")
+
+        # Limites do tabuleiro: linhas/colunas que cruzam uma faixa de fundo inteira
+        colunas = mask.sum(axis=0)
+        linhas = mask.sum(axis=1)
+        if not colunas.any():
+            raise ValueError("Grade não encontrada. Fundo do tabuleiro ausente.")
+        xs = np.flatnonzero(colunas >= 0.5 * colunas.max())
+        ys = np.flatnonzero(linhas >= 0.5 * linhas.max())
+        x_min, x_max = int(xs[0]), int(xs[-1]) + 1
+        y_min, y_max = int(ys[0]), int(ys[-1]) + 1
+        mask_grade = mask[y_min:y_max, x_min:x_max]
+
+        # Faixas de tiles: trechos em que a projeção normalizada cai
+        faixas_x = self._faixas_projecao(mask_grade.mean(axis=0))
+        faixas_y = self._faixas_projecao(mask_grade.mean(axis=1))
+        if len(faixas_x) != 4 or len(faixas_y) != 4:
+            raise ValueError(
+                "Grade não encontrada. Faixas detectadas:", len(faixas_y), len(faixas_x)
+            )
+
+        tiles = [
+            Tile(x0, y0, x1 - x0, y1 - y0) for y0, y1 in faixas_y for x0, x1 in faixas_x
+        ]
+        return (x_min, y_min, x_max, y_max), tiles
+
+    @staticmethod
+    def _faixas_projecao(perfil: np.ndarray) -> list[tuple[int, int]]:
+        """Intervalos [início, fim) em que a projeção do fundo fica abaixo da
+        metade, ignorando trechos curtos (ruído)
+
+        Args:
+            perfil (np.ndarray): Fração de pixels de fundo por linha/coluna
+
+        Returns:
+            list[tuple[int, int]]: Intervalos dos tiles
+        """
+        tile = (perfil < 0.5).astype(np.int8)
+        bordas = np.diff(np.concatenate(([0], tile, [0])))
+        inicios = np.flatnonzero(bordas == 1)
+        fins = np.flatnonzero(bordas == -1)
+        if not len(inicios):
+            return []
+        tamanhos = fins - inicios
+        validos = tamanhos >= 0.5 * tamanhos.max()
+        return [(int(i), int(f)) for i, f in zip(inicios[validos], fins[validos])]
+
     def _sort_tiles(
         self, screenshot: cv2.typing.MatLike, tiles: list[Tile]
     ) -> list[Tile]:
@@ -452,16 +850,169 @@ class Sensor:
         self,
         grid: cv2.typing.MatLike,
         tiles: list[Tile],
+        previsto: np.ndarray | None = None,
     ) -> np.ndarray[tuple[int, int], np.dtype[np.int64]]:
         """Extrai os valores dos tiles da grade
 
         Args:
             grid (cv2.typing.MatLike): Imagem da grade
             tiles (list[Tile]): Tiles
+            previsto (np.ndarray | None, optional): Tabuleiro esperado sem o
+                tile novo. Defaults to None.
 
         Returns:
             np.ndarray[tuple[int, int], np.dtype[np.int64]]: Matriz com os valores
         """
+        valores = None
+        if previsto is not None:
+            valores = self._verificar_previsto(grid, tiles, previsto)
+        if valores is None:
+            valores = self._reconhecer_alterados(grid, tiles)
+
+        if self.diferenca_quadros:
+            self.grade_anterior = grid
+            self.tiles_anteriores = tiles
+            self.valores_anteriores = valores
+        return valores.reshape((4, 4))
+
+    def _reconhecer_alterados(
+        self, grid: cv2.typing.MatLike, tiles: list[Tile]
+    ) -> np.ndarray:
+        """Reconhece os tiles alterados desde o último quadro e reaproveita os
+        valores dos demais"""
+        alterados = self._tiles_alterados(grid, tiles)
+        if len(alterados) == len(tiles):
+            return self._reconhecer(grid, tiles)
+
+        logger.debug(f"Tiles alterados desde o último quadro: {alterados.tolist()}")
+        valores = self.valores_anteriores.copy()
+        if len(alterados):
+            valores[alterados] = self._reconhecer(grid, [tiles[i] for i in alterados])
+        return valores
+
+    def _verificar_previsto(
+        self, grid: cv2.typing.MatLike, tiles: list[Tile], previsto: np.ndarray
+    ) -> np.ndarray | None:
+        """Confere o tabuleiro previsto procurando o tile novo só nas células
+        que deveriam estar vazias
+
+        A ocupação é decidida pela cor de fundo (vetorizada); só a célula
+        ocupada passa pelo reconhecimento.
+
+        Args:
+            grid (cv2.typing.MatLike): Imagem da grade
+            tiles (list[Tile]): Tiles
+            previsto (np.ndarray): Tabuleiro esperado sem o tile novo
+
+        Returns:
+            np.ndarray | None: Valores dos tiles, ou None se a imagem não
+            confere com a previsão (exatamente um 2 ou 4 novo)
+        """
+        previsto = np.asarray(previsto, dtype=int).ravel()
+        vazios = np.flatnonzero(previsto == 0)
+        if len(previsto) != len(tiles) or not len(vazios):
+            return None
+
+        amostras = self._amostrar_fundo(grid, [tiles[i] for i in vazios])
+        ocupados = vazios[
+            np.linalg.norm(amostras - PALETA_TILES[0], axis=1) > DISTANCIA_MAX_COR
+        ]
+        if len(ocupados) != 1:
+            logger.debug(f"Previsão não confere: {len(ocupados)} tiles novos")
+            return None
+
+        novo = self._reconhecer(grid, [tiles[ocupados[0]]])[0]
+        if novo not in (2, 4):
+            logger.debug(f"Previsão não confere: tile novo lido como {novo}")
+            return None
+
+        valores = previsto.copy()
+        valores[ocupados[0]] = novo
+        return valores
+
+    def _tiles_alterados(
+        self, grid: cv2.typing.MatLike, tiles: list[Tile]
+    ) -> np.ndarray:
+        """Índices dos tiles cujos pixels mudaram desde o último quadro lido
+
+        Compara as grades em escala reduzida (absdiff 1/4, que ignora ruído de
+        pixel isolado). Sem quadro anterior compatível (mesma geometria), todos
+        os tiles contam como alterados.
+
+        Args:
+            grid (cv2.typing.MatLike): Imagem da grade
+            tiles (list[Tile]): Tiles
+
+        Returns:
+            np.ndarray: Índices dos tiles a reler
+        """
+        todos = np.arange(len(tiles))
+        if (
+            not self.diferenca_quadros
+            or self.grade_anterior is None
+            or self.grade_anterior.shape != grid.shape
+            or self.tiles_anteriores != tiles
+        ):
+            return todos
+
+        diferenca = cv2.cvtColor(
+            cv2.absdiff(grid, self.grade_anterior), cv2.COLOR_BGR2GRAY
+        )
+        reduzida = cv2.resize(
+            diferenca, None, fx=0.25, fy=0.25, interpolation=cv2.INTER_AREA
+        )
+        alterado = [
+            reduzida[t.y // 4 : (t.y + t.h) // 4, t.x // 4 : (t.x + t.w) // 4].max(
+                initial=0
+            )
+            > LIMIAR_DIFERENCA
+            for t in tiles
+        ]
+        return todos[alterado]
+
+    def _reconhecer(self, grid: cv2.typing.MatLike, tiles: list[Tile]) -> np.ndarray:
+        """Reconhece os valores dos tiles com o OCRMethod configurado
+
+        Args:
+            grid (cv2.typing.MatLike): Imagem da grade
+            tiles (list[Tile]): Tiles a ler
+
+        Returns:
+            np.ndarray: Valores na ordem de tiles
+        """
+        if self.ocr_method == OCRMethod.COR:
+            valores = self._ler_por_cor(grid, tiles)
+            desconhecidos = np.flatnonzero(valores < 0)
+            if len(desconhecidos):
+                logger.debug(f"Tiles com cor desconhecida: {desconhecidos.tolist()}")
+                imgs = self._binarizar_tiles(grid, [tiles[i] for i in desconhecidos])
+                valores[desconhecidos] = self._ler_tiles(imgs)
+            return valores
+
+        imgs_padronizadas = self._binarizar_tiles(grid, tiles)
+        if self.classificador is not None:
+            valores, confiancas = self.classificador.prever(imgs_padronizadas)
+            incertos = np.flatnonzero(confiancas < CONFIANCA_MIN_CLASSIFICADOR)
+            if len(incertos):
+                logger.debug(f"Tiles incertos no classificador: {incertos.tolist()}")
+                valores[incertos] = self._ler_tiles(
+                    [imgs_padronizadas[i] for i in incertos]
+                )
+            return valores
+        return np.array(self._ler_tiles(imgs_padronizadas), dtype=int)
+
+    def _binarizar_tiles(
+        self, grid: cv2.typing.MatLike, tiles: list[Tile]
+    ) -> list[cv2.typing.MatLike]:
+        """Binariza a grade e recorta cada tile no tamanho padrão do OCR
+
+        Args:
+            grid (cv2.typing.MatLike): Imagem da grade
+            tiles (list[Tile]): Tiles
+
+        Returns:
+            list[cv2.typing.MatLike]: Imagens TILE_SIZE dos tiles
+        """
         gray = cv2.cvtColor(grid, cv2.COLOR_BGR2GRAY)
         # Threshold para números brancos
         _, thresh_light = cv2.threshold(gray, 240, 255, cv2.THRESH_BINARY)
@@ -476,14 +1027,116 @@ class Sensor:
             tile_img = cv2.resize(tile_img, TILE_SIZE, interpolation=cv2.INTER_CUBIC)
             debug.save_image(tile_img, f"tile_{t.x}_{t.y}")
             imgs_padronizadas.append(tile_img)
+        return imgs_padronizadas
+
+    def _ler_tiles(self, imgs: list[cv2.typing.MatLike]) -> list[int]:
+        """Lê os tiles pelo cache de OCR e aplica o OCR só nas imagens novas
+
+        Args:
+            imgs (list[cv2.typing.MatLike]): Imagens dos tiles
+
+        Returns:
+            list[int]: Valores extraídos
+        """
+        if self.ocr_cache is None and not self.registrar_tiles:
+            return self._aplicar_ocr(imgs)
 
-        if self.ler_texto == self._ocr_tesseract_parallel:
-            resultados_ocr = self._ocr_tesseract_parallel(imgs_padronizadas)
-        elif self.ler_texto == self._ocr_easyocr_parallel:
-            resultados_ocr = self._ocr_easyocr_parallel(imgs_padronizadas)
+        chaves = [phash(img) for img in imgs]
+        if self.ocr_cache is None:
+            valores = [None] * len(imgs)
         else:
-            resultados_ocr = [self.ler_texto(img) for img in imgs_padronizadas]
-        return np.array(resultados_ocr, dtype=int).reshape((4, 4))
+            valores = [self.ocr_cache.get(chave) for chave in chaves]
+        faltando = [i for i, valor in enumerate(valores) if valor is None]
+        if faltando:
+            lidos = self._aplicar_ocr([imgs[i] for i in faltando])
+            for i, valor in zip(faltando, lidos):
+                valores[i] = valor
+                if not valor_valido(valor):
+                    continue
+                if self.ocr_cache is not None:
+                    self.ocr_cache.put(chaves[i], valor)
+                if self.registrar_tiles:
+                    salvar_exemplo(imgs[i], valor, chaves[i])
+        if self.ocr_cache is not None:
+            logger.debug(
+                f"Cache de OCR: {len(imgs) - len(faltando)}/{len(imgs)} hits "
+                f"(hit rate {self.ocr_cache.hit_rate:.1%})"
+            )
+        return valores
+
+    def salvar_cache(self) -> None:
+        """Persiste o cache de OCR em disco"""
+        if self.ocr_cache is not None:
+            self.ocr_cache.salvar()
+
+    def _aplicar_ocr(self, imgs: list[cv2.typing.MatLike]) -> list[int]:
+        """Aplica o OCR configurado às imagens dos tiles
+
+        Args:
+            imgs (list[cv2.typing.MatLike]): Imagens dos tiles
+
+        Returns:
+            list[int]: Valores extraídos
+        """
+        # Métodos que recebem todas as imagens de uma vez
+        if self.ler_texto in (
+            self._ocr_tesseract_parallel,
+            self._ocr_easyocr_parallel,
+            self._ocr_tesseract_mosaico,
+            self._ocr_easyocr_reconhecedor,
+        ):
+            return self.ler_texto(imgs)
+        return [self.ler_texto(img) for img in imgs]
+
+    def _ler_por_cor(self, grid: cv2.typing.MatLike, tiles: list[Tile]) -> np.ndarray:
+        """Lê os valores pela cor de fundo dos tiles (cor mais próxima da paleta)
+
+        Amostra uma faixa no topo de cada tile, acima do número, e compara a
+        mediana com todas as cores de PALETA_TILES de uma vez.
+
+        Args:
+            grid (cv2.typing.MatLike): Imagem da grade
+            tiles (list[Tile]): Tiles
+
+        Returns:
+            np.ndarray: Valores dos tiles (-1 para cores fora da paleta)
+        """
+        amostras = self._amostrar_fundo(grid, tiles)
+        distancias = np.linalg.norm(amostras[:, None, :] - PALETA_BGR[None], axis=2)
+        mais_proxima = distancias.argmin(axis=1)
+        valores = PALETA_VALORES[mais_proxima]
+        desconhecido = (
+            distancias[np.arange(len(tiles)), mais_proxima] > DISTANCIA_MAX_COR
+        )
+        valores[desconhecido] = -1
+        return valores
+
+    def _amostrar_fundo(
+        self, grid: cv2.typing.MatLike, tiles: list[Tile]
+    ) -> np.ndarray:
+        """Cor de fundo (mediana BGR) de uma faixa no topo de cada tile
+
+        Args:
+            grid (cv2.typing.MatLike): Imagem da grade
+            tiles (list[Tile]): Tiles
+
+        Returns:
+            np.ndarray: (len(tiles), 3) cores
+        """
+        x = np.array([t.x for t in tiles])
+        y = np.array([t.y for t in tiles])
+        w = np.array([t.w for t in tiles])
+        h = np.array([t.h for t in tiles])
+
+        # Faixa de mesmo tamanho em todos os tiles: (16, alt, larg, 3) em uma indexação
+        alt = max(1, int(h.min() * 0.08))
+        larg = max(1, int(w.min() * 0.5))
+        y0 = y + (h * 0.06).astype(int)
+        x0 = x + (w - larg) // 2
+        linhas = y0[:, None, None] + np.arange(alt)[None, :, None]
+        colunas = x0[:, None, None] + np.arange(larg)[None, None, :]
+        faixas = grid[linhas, colunas].reshape(len(tiles), -1, 3)
+        return np.median(faixas, axis=1)
 
     def _ocr_easyocr(self, img: cv2.typing.MatLike) -> int:
         """Aplica OCR com EasyOCR
@@ -522,6 +1175,63 @@ class Sensor:
         with ThreadPoolExecutor(max_workers=16) as executor:
             return list(executor.map(self._ocr_tesseract, imgs))
 
+    def _ocr_tesseract_mosaico(self, imgs: list[cv2.typing.MatLike]) -> list[int]:
+        """Aplica OCR com Tesseract uma única vez em um mosaico com todos os tiles
+
+        Os tiles são colados em uma grade de 4 colunas separados por faixas
+        vazias; as caixas das palavras (image_to_data) são mapeadas de volta
+        para a célula pelo centro.
+
+        Args:
+            imgs (list[cv2.typing.MatLike]): Imagens dos tiles
+
+        Returns:
+            list[int]: Valores extraídos
+        """
+        if not imgs:
+            return []
+        tile_w, tile_h = TILE_SIZE
+        passo_x = tile_w + MOSAICO_SEPARADOR
+        passo_y = tile_h + MOSAICO_SEPARADOR
+        colunas = min(4, len(imgs))
+        linhas = -(-len(imgs) // colunas)
+
+        # Texto preto em fundo branco (os tiles binarizados têm texto branco)
+        mosaico = np.full(
+            (
+                linhas * passo_y + MOSAICO_SEPARADOR,
+                colunas * passo_x + MOSAICO_SEPARADOR,
+            ),
+            255,
+            dtype=np.uint8,
+        )
+        for i, img in enumerate(imgs):
+            y = MOSAICO_SEPARADOR + (i // colunas) * passo_y
+            x = MOSAICO_SEPARADOR + (i % colunas) * passo_x
+            mosaico[y : y + tile_h, x : x + tile_w] = cv2.bitwise_not(img)
+        debug.save_image(mosaico, "mosaico")
+
+        config = "--psm 11 --oem 3 -c tessedit_char_whitelist=0123456789"
+        dados = pytesseract.image_to_data(
+            mosaico, config=config, output_type=pytesseract.Output.DICT
+        )
+
+        # Palavras de cada célula, da esquerda para a direita
+        textos: list[list[tuple[int, str]]] = [[] for _ in imgs]
+        for texto, left, top, w, h in zip(
+            dados["text"], dados["left"], dados["top"], dados["width"], dados["height"]
+        ):
+            texto = texto.strip()
+            if not texto.isdigit():
+                continue
+            coluna = (left + w // 2 - MOSAICO_SEPARADOR // 2) // passo_x
+            linha = (top + h // 2 - MOSAICO_SEPARADOR // 2) // passo_y
+            i = linha * colunas + coluna
+            if 0 <= coluna < colunas and 0 <= i < len(imgs):
+                textos[i].append((left, texto))
+
+        return [int("".join(t for _, t in sorted(p))) if p else 0 for p in textos]
+
     def _ocr_easyocr_parallel(self, imgs: list[cv2.typing.MatLike]) -> list[int]:
         """Aplica OCR com EasyOCR em lote (batched) usando GPU (mais eficiente)
 
@@ -534,5 +1244,46 @@ class Sensor:
         resultados = self.reader.readtext_batched(imgs, detail=0, paragraph=False)
         return [int(r[0]) if r else 0 for r in resultados]
 
+    def _ocr_easyocr_reconhecedor(self, imgs: list[cv2.typing.MatLike]) -> list[int]:
+        """Aplica só o reconhecedor do EasyOCR, em lote, nas caixas dos tiles
+
+        Os tiles vão lado a lado em uma faixa e cada um vira uma caixa de
+        horizontal_list, então o detector de texto (CRAFT) não roda. Tiles
+        sem pixels de texto são lidos como vazios sem passar pelo OCR.
+
+        Args:
+            imgs (list[cv2.typing.MatLike]): Imagens dos tiles
+
+        Returns:
+            list[int]: Valores extraídos
+        """
+        valores = [0] * len(imgs)
+        com_texto = [
+            i for i, img in enumerate(imgs) if cv2.countNonZero(img) >= PIXELS_MIN_TEXTO
+        ]
+        if not com_texto:
+            return valores
+
+        tile_w, tile_h = TILE_SIZE
+        faixa = np.hstack([imgs[i] for i in com_texto])
+        caixas = [
+            [j * tile_w, (j + 1) * tile_w, 0, tile_h] for j in range(len(com_texto))
+        ]
+        resultados = self.reader.recognize(
+            faixa,
+            horizontal_list=caixas,
+            free_list=[],
+            batch_size=len(caixas),
+            allowlist="0123456789",
+        )
+
+        # O EasyOCR reordena as caixas: mapeia pela posição x de cada uma
+        for caixa, texto, _ in resultados:
+            j = int(caixa[0][0]) // tile_w
+            if texto.isdigit() and 0 <= j < len(com_texto):
+                valores[com_texto[j]] = int(texto)
+        return valores
+
     def __del__(self):
+        self.salvar_cache()
         self.sct.close()
@@ -1,78 +1,326 @@
+import logging
+import threading
+from enum import Enum, auto
+from pathlib import Path
+
 import numpy as np
+from core import bitboard, heuristic
+from core.ntuple import NTUPLE_PATH, NTupleNetwork
+from core.rollout import MonteCarlo
+from core.search import Expectimax, ExpectimaxParalelo, TempoEsgotado
 from logger_config import logger
 
 
+class MoveStrategy(Enum):
+    MAIS_VAZIOS = auto()
+    EXPECTIMAX = auto()
+    EXPECTIMAX_PARALELO = auto()
+    MONTE_CARLO = auto()
+
+
+class Avaliador(Enum):
+    HEURISTICA = auto()
+    NTUPLE = auto()
+
+
 class Think:
-    def compress(self, row):
-        return [i for i in row if i != 0]
+    def __init__(
+        self,
+        strategy: MoveStrategy = MoveStrategy.MAIS_VAZIOS,
+        depth: int = 3,
+        prob_cutoff: float = 1e-3,
+        time_budget: float | None = None,
+        workers: int | None = None,
+        rollouts: int = 100,
+        rollout_depth: int = 20,
+        avaliador: Avaliador = Avaliador.HEURISTICA,
+        ntuple_path: Path = NTUPLE_PATH,
+        especulacao_fracao: float = 0.25,
+    ) -> None:
+        # A rede de N-tuplas é carregada uma vez aqui (.npy lido inteiro na memória)
+        self.avaliador = avaliador
+        if avaliador == Avaliador.NTUPLE:
+            rede = NTupleNetwork.load(ntuple_path)
+            avaliar, valor_perda = rede.avaliar, rede.valor_perda()
+        else:
+            avaliar, valor_perda = heuristic.avaliar, heuristic.VALOR_PERDA
+
+        # A rede estima os pontos futuros a partir do afterstate (como no treino)
+        afterstates = avaliador == Avaliador.NTUPLE
+        self.expectimax = Expectimax(
+            depth,
+            prob_cutoff,
+            avaliar,
+            time_budget,
+            valor_perda=valor_perda,
+            afterstates=afterstates,
+        )
+        self.expectimax_paralelo = ExpectimaxParalelo(
+            depth,
+            prob_cutoff,
+            avaliar,
+            time_budget,
+            workers=workers,
+            valor_perda=valor_perda,
+            afterstates=afterstates,
+        )
+        self.monte_carlo = MonteCarlo(rollouts, rollout_depth, time_budget)
+        self.search_depths: list[int] = []
+        self.search_nodes: list[int] = []
+        # Busca especulativa durante a animação: bitboard após o tile novo ->
+        # (movimento, resultado, profundidade, nós)
+        self.especulados: dict[int, tuple[str | None, int | None, list, list]] = {}
+        self.especulacao: threading.Thread | None = None
+        self.cancelar_especulacao = threading.Event()
+        self.acertos_especulacao = 0
+        # Com time_budget, cada tabuleiro especulado recebe esta fração dele
+        self.especulacao_fracao = especulacao_fracao
+        self.falhas_especulacao = 0
+        self.set_move_strategy(strategy)
+
+    def set_move_strategy(self, strategy: MoveStrategy) -> None:
+        self.strategy = strategy
+        self.escolher_movimento = {
+            MoveStrategy.MAIS_VAZIOS: self._move_mais_vazios,
+            MoveStrategy.EXPECTIMAX: self._move_expectimax,
+            MoveStrategy.EXPECTIMAX_PARALELO: self._move_expectimax_paralelo,
+            MoveStrategy.MONTE_CARLO: self._move_monte_carlo,
+        }.get(strategy, self._move_mais_vazios)
+        if strategy == MoveStrategy.EXPECTIMAX_PARALELO:
+            # Sobe os workers agora, fora do tempo da primeira jogada
+            self.expectimax_paralelo.aquecer()
+
+    @property
+    def buscas(self) -> tuple[Expectimax, ...]:
+        return (self.expectimax, self.expectimax_paralelo)
+
+    def set_depth(self, depth: int) -> None:
+        for busca in self.buscas:
+            busca.depth = depth
+
+    def set_prob_cutoff(self, prob_cutoff: float) -> None:
+        for busca in self.buscas:
+            busca.prob_cutoff = prob_cutoff
+
+    def set_time_budget(self, time_budget: float | None) -> None:
+        for busca in self.buscas:
+            busca.time_budget = time_budget
+        self.monte_carlo.time_budget = time_budget
+
+    def set_rollouts(self, rollouts: int, rollout_depth: int | None = None) -> None:
+        self.monte_carlo.rollouts = rollouts
+        if rollout_depth is not None:
+            self.monte_carlo.depth = rollout_depth
+
+    def nova_partida(self) -> None:
+        """Reinicia as tabelas de transposição (mantidas entre jogadas da partida)"""
+        self.parar_especulacao()
+        self.especulados.clear()
+        for busca in self.buscas:
+            busca.nova_partida()
+
+    def estatisticas_busca(self) -> dict[str, float]:
+        """Resumo das buscas desde a última chamada (chame uma vez por partida)
+
+        Zera search_depths/search_nodes e os contadores das tabelas de
+        transposição, que assim não crescem entre partidas.
+
+        Returns:
+            dict[str, float]: Profundidade e nós (média e máximo por movimento)
+            e hits/misses/entradas da tabela de transposição (para dimensioná-la;
+            as entradas das tabelas dos workers da busca paralela não contam)
+        """
+        resumo = {
+            "profundidade_media": (
+                float(np.mean(self.search_depths)) if self.search_depths else 0.0
+            ),
+            "profundidade_max": max(self.search_depths, default=0),
+            "nos_medio": (
+                float(np.mean(self.search_nodes)) if self.search_nodes else 0.0
+            ),
+            "nos_max": max(self.search_nodes, default=0),
+            "cache_hits": sum(busca.cache.hits for busca in self.buscas),
+            "cache_misses": sum(busca.cache.misses for busca in self.buscas),
+            "cache_entradas": sum(len(busca.cache) for busca in self.buscas),
+        }
+        consultas = resumo["cache_hits"] + resumo["cache_misses"]
+        resumo["cache_hit_rate"] = (
+            resumo["cache_hits"] / consultas if consultas else 0.0
+        )
+        self.search_depths.clear()
+        self.search_nodes.clear()
+        for busca in self.buscas:
+            busca.cache.hits = busca.cache.misses = 0
+        return resumo
+
+    def close(self) -> None:
+        """Encerra o pool de processos da busca paralela (se criado)"""
+        self.parar_especulacao()
+        self.expectimax_paralelo.close()
 
     def count_empty(self, board):
         return np.count_nonzero(board == 0)
 
-    def merge(self, row):
-        new_row = []
-        skip = False
-        for i in range(len(row)):
-            if skip:
-                skip = False
-                continue
-            if i + 1 < len(row) and row[i] == row[i + 1]:
-                new_row.append(row[i] * 2)
-                skip = True
-            else:
-                new_row.append(row[i])
-        return new_row
-
     def move_left(self, board: np.ndarray) -> np.ndarray:
-        new_board = []
-        for row in board:
-            compressed = self.compress(row)
-            merged = self.merge(compressed)
-            filled = merged + [0] * (4 - len(merged))
-            new_board.append(filled)
-        return np.array(new_board)
+        return bitboard.decode(bitboard.move_left(bitboard.encode(board)))
 
     def move_right(self, board: np.ndarray) -> np.ndarray:
-        reversed_board = np.fliplr(board)
-        moved = self.move_left(reversed_board)
-        return np.fliplr(moved)
+        return bitboard.decode(bitboard.move_right(bitboard.encode(board)))
 
     def move_up(self, board: np.ndarray) -> np.ndarray:
-        transposed = board.T
-        moved = self.move_left(transposed)
-        return moved.T
+        return bitboard.decode(bitboard.move_up(bitboard.encode(board)))
 
     def move_down(self, board: np.ndarray) -> np.ndarray:
-        transposed = board.T
-        moved = self.move_right(transposed)
-        return moved.T
+        return bitboard.decode(bitboard.move_down(bitboard.encode(board)))
 
-    def best_move(self, board: np.ndarray):
-        moves = {
-            "up": self.move_up(board),
-            "down": self.move_down(board),
-            "left": self.move_left(board),
-            "right": self.move_right(board),
-        }
+    def valid_moves(self, estado: int) -> dict[str, int]:
+        """Aplica os quatro movimentos ao bitboard e mantém os que geram mudança
 
-        logger.debug(f"Estado atual do tabuleiro:\n{board}")
+        Args:
+            estado (int): Bitboard atual
 
-        # Filtra os movimentos que geram mudança
-        valid_moves: dict[str, np.ndarray] = {}
-        for move, new_board in moves.items():
-            if not np.array_equal(board, new_board):
-                valid_moves[move] = new_board
-                logger.debug(
-                    f"Movimento: {move}\n{new_board}",
-                )
-            else:
+        Returns:
+            dict[str, int]: Movimento -> bitboard resultante
+        """
+        valid_moves: dict[str, int] = {}
+        debug = logger.isEnabledFor(logging.DEBUG)
+        for move, mover in bitboard.MOVES.items():
+            novo = mover(estado)
+            if novo != estado:
+                valid_moves[move] = novo
+                if debug:
+                    logger.debug(f"Movimento: {move}\n{bitboard.decode(novo)}")
+            elif debug:
                 logger.debug(f"Movimento: {move} (inválido — sem mudança)")
+        return valid_moves
 
-        if not valid_moves:
+    def best_move(self, board: np.ndarray):
+        logger.debug("Estado atual do tabuleiro:\n%s", board)
+
+        estado = bitboard.encode(board)
+        self.parar_especulacao()
+        especulado = self.especulados.get(estado)
+        if especulado is not None:
+            self.acertos_especulacao += 1
+            move, estado, depths, nodes = especulado
+            self.search_depths.extend(depths)
+            self.search_nodes.extend(nodes)
+            logger.debug("Movimento já calculado durante a animação")
+        else:
+            if self.especulados:
+                self.falhas_especulacao += 1
+            move, estado = self.escolher_movimento(estado)
+        self.especulados.clear()
+        if move is None:
             logger.debug("Nenhum movimento possível. Game over.")
             return None, None
 
+        logger.debug(f">> Melhor movimento escolhido: {move}")
+        return move, bitboard.decode(estado)
+
+    # ============================================================
+    # Especulação (pipeline sensor/think/act)
+    # ============================================================
+    def especular(self, board: np.ndarray) -> None:
+        """Começa a calcular, em segundo plano, a resposta para cada tile que
+        pode surgir no tabuleiro previsto (o resultado do movimento enviado)
+
+        Roda enquanto a animação acontece; o próximo best_move usa a resposta
+        pronta se o tabuleiro lido for um dos especulados. Os tiles 2 (90%)
+        vêm antes dos tiles 4.
+
+        Args:
+            board (np.ndarray): Tabuleiro previsto, antes do tile novo
+        """
+        self.parar_especulacao()
+        self.especulados.clear()
+        estado = bitboard.encode(board)
+        vazios = [4 * i for i in range(16) if not (estado >> (4 * i)) & 0xF]
+        filhos = [estado | (1 << shift) for shift in vazios]
+        filhos += [estado | (2 << shift) for shift in vazios]
+
+        self.cancelar_especulacao.clear()
+        self.especulacao = threading.Thread(
+            target=self._especular, args=(filhos,), daemon=True
+        )
+        self.especulacao.start()
+
+    def parar_especulacao(self) -> None:
+        """Interrompe a especulação; as respostas prontas ficam guardadas
+
+        A busca em andamento confere o sinal a cada 256 nós (e, no pool,
+        a cada INTERVALO_CANCELAMENTO). As tarefas ainda na fila do pool são
+        descartadas e as que já rodam param na próxima conferência. O Monte
+        Carlo só para ao fim do lote de partidas em andamento.
+        """
+        if self.especulacao is not None:
+            self.cancelar_especulacao.set()
+            self.especulacao.join()
+            self.especulacao = None
+
+    def _especular(self, filhos: list[int]) -> None:
+        # Cada filho recebe uma fração do tempo de um movimento real, e o sinal
+        # de cancelamento chega dentro das buscas
+        buscas = (*self.buscas, self.monte_carlo)
+        time_budget = self.expectimax.time_budget
+        if time_budget is not None:
+            self.set_time_budget(time_budget * self.especulacao_fracao)
+        for busca in buscas:
+            busca.cancelar = self.cancelar_especulacao
+        try:
+            for filho in filhos:
+                # As estatísticas só entram em search_depths/nodes se a resposta for usada
+                n = len(self.search_depths)
+                try:
+                    move, novo = self.escolher_movimento(filho)
+                except TempoEsgotado:
+                    return
+                finally:
+                    depths, nodes = self.search_depths[n:], self.search_nodes[n:]
+                    del self.search_depths[n:], self.search_nodes[n:]
+                # Busca cortada pelo cancelamento (Monte Carlo devolve parcial)
+                if self.cancelar_especulacao.is_set():
+                    return
+                self.especulados[filho] = (move, novo, depths, nodes)
+        finally:
+            for busca in buscas:
+                busca.cancelar = None
+            self.set_time_budget(time_budget)
+
+    # ============================================================
+    # Estrategias
+    # ============================================================
+    def _move_mais_vazios(self, estado: int) -> tuple[str | None, int | None]:
+        # Filtra os movimentos que geram mudança
+        valid_moves = self.valid_moves(estado)
+        if not valid_moves:
+            return None, None
+
         # Escolhe o melhor baseado no número de espaços vazios
-        best = max(valid_moves.items(), key=lambda item: self.count_empty(item[1]))
-        logger.debug(f">> Melhor movimento escolhido: {best[0]}")
-        return best
+        return max(valid_moves.items(), key=lambda item: bitboard.count_empty(item[1]))
+
+    def _move_expectimax(self, estado: int) -> tuple[str | None, int | None]:
+        return self._buscar(self.expectimax, estado)
+
+    def _move_expectimax_paralelo(self, estado: int) -> tuple[str | None, int | None]:
+        return self._buscar(self.expectimax_paralelo, estado)
+
+    def _move_monte_carlo(self, estado: int) -> tuple[str | None, int | None]:
+        return self._buscar(self.monte_carlo, estado)
+
+    def _buscar(
+        self, busca: Expectimax | MonteCarlo, estado: int
+    ) -> tuple[str | None, int | None]:
+        move, novo = busca.best_move(estado)
+        self.search_depths.append(busca.depth_reached)
+        self.search_nodes.append(busca.nodes)
+        logger.debug(
+            f"{type(busca).__name__}: {busca.nodes} nós avaliados "
+            f"(profundidade {busca.depth_reached})"
+        )
+        if isinstance(busca, Expectimax):
+            logger.debug(
+                f"Cache de transposição: {len(busca.cache)} entradas, "
+                f"hit rate {busca.cache.hit_rate:.1%}"
+            )
+        return move, novo
@@ -1,158 +1,211 @@
-import json
+import sys
 import time
-import uuid
-from datetime import datetime
-from itertools import product
+from dataclasses import dataclass
 from pathlib import Path
 
+# Raiz do repositório no sys.path: bot/core e os módulos abaixo importam o
+# pacote compartilhado/ (o script roda de dentro da pasta do projeto)
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
 import numpy as np
-import pandas as pd
 from bot import Bot
 from core.sensor import GradeMethod, OCRMethod
+from core.think import MoveStrategy
 from logger_config import logger
 
-# ---------- FASE 1: Testes de desempenho (OCR + GRID) ----------
-MAX_PARTIDAS = 20
-MAX_MOVIMENTOS = 50
-
-resultados_fase1 = []
-combinacoes = list(product(OCRMethod, GradeMethod))
+from compartilhado import modelos
+from compartilhado.resultados import Resultados
 
 # Diretórios de resultados (padrão parecido com outros projetos)
 RESULTADOS_DIR = Path("resultados")
 TEMP_BATCH_DIR = RESULTADOS_DIR / "temp_batches"
-RESULTADOS_DIR.mkdir(exist_ok=True)
-TEMP_BATCH_DIR.mkdir(exist_ok=True)
+# Dataset parquet (pasta com uma parte por consolidação)
+OUTPUT_FILE = RESULTADOS_DIR / "resultados_2048_final.parquet"
 
+# Uma partida é identificada pela fase, combinação e índice: ao reiniciar o
+# script, as já gravadas (no final ou nos temporários) são puladas
+CHAVES = ["fase", "ocr", "grade", "run_index"]
 
-def save_batch_temp(df: pd.DataFrame, tag: str | None = None) -> Path:
-    """Salva um dataframe como parquet temporário identificado por tag+uuid."""
-    if tag is None:
-        tag = "batch"
-    timestamp = datetime.now().strftime("%Y%m%dT%H%M%S")
-    uid = uuid.uuid4().hex[:8]
-    fname = f"{tag}_{timestamp}_{uid}.parquet"
-    path = TEMP_BATCH_DIR / fname
-    df.to_parquet(path, index=False)
-    logger.info(f"Batch temporário salvo: {path.name} ({len(df)} linhas)")
-    return path
 
+@dataclass(frozen=True)
+class Fase:
+    nome: str
+    combinacoes: list[tuple[OCRMethod, GradeMethod]]
+    partidas: int
+    max_movimentos: int
+    move_strategy: MoveStrategy = MoveStrategy.MAIS_VAZIOS
 
-for ocr_method, grade_method in combinacoes:
-    bot = Bot(ocr_method, grade_method)
-    bot.start()
-    bot.bot_ativo = True
 
-    while not bot.is_active():
-        time.sleep(1)
+# ---------- FASE 1: Testes de desempenho (OCR + GRID) ----------
+# Listadas explicitamente: um método novo nos enums não multiplica a fase
+COMBINACOES_FASE1 = [
+    (ocr, grade)
+    for ocr in (
+        OCRMethod.TESSERACT,
+        OCRMethod.EASYOCR,
+        OCRMethod.TESSERACT_THREAD,
+        OCRMethod.EASYOCR_THREAD,
+    )
+    for grade in (
+        GradeMethod.CANNY,
+        GradeMethod.CANNY_FIXED,
+        GradeMethod.COR,
+        GradeMethod.COR_FIXED,
+    )
+]
+# Métodos novos, cada um contra a referência do outro eixo
+COMBINACOES_NOVOS = [
+    (OCRMethod.TESSERACT_MOSAICO, GradeMethod.COR_FIXED),
+    (OCRMethod.EASYOCR_RECONHECEDOR, GradeMethod.COR_FIXED),
+    (OCRMethod.CLASSIFICADOR, GradeMethod.COR_FIXED),
+    (OCRMethod.COR, GradeMethod.COR_FIXED),
+    (OCRMethod.EASYOCR_THREAD, GradeMethod.PROJECAO),
+    (OCRMethod.EASYOCR_THREAD, GradeMethod.PROJECAO_FIXED),
+]
 
-    falhas_grid = 0
-    maiores_numeros = []
-    pontuacoes = []
-    tempos_partida = []
-    logger.info("Testando combinação: %s", (ocr_method.name, grade_method.name))
+# ---------- FASE 2: Teste heurística (100 partidas sem limite) ----------
+FASES = [
+    Fase("ocr_grade", COMBINACOES_FASE1, 20, 50),
+    Fase("ocr_grade_novos", COMBINACOES_NOVOS, 20, 50),
+    Fase("think", [(OCRMethod.EASYOCR_THREAD, GradeMethod.COR_FIXED)], 100, 9999),
+]
 
-    for partida in range(1, MAX_PARTIDAS + 1):
-        retry = True
-        while retry:
-            retry = False
-            logger.info(f"Partida {partida}/{MAX_PARTIDAS}")
-            board_final, falha, duracao = bot.run(MAX_MOVIMENTOS)
-            falhas_grid += falha
-            tempos_partida.append(duracao)
-
-            if board_final is not None:
-                try:
-                    maiores_numeros.append(int(np.max(board_final)))
-                    logger.info("Maior número alcançado: %d", maiores_numeros[-1])
-                except Exception as e:
-                    retry = True
-                    logger.error(f"Erro ao acessar board: {e}")
-            else:
-                retry = True
-                logger.error(f"Erro ao acessar board")
 
-            try:
-                pontuacoes.append(bot.sensor.extrair_score())
-                logger.info("Pontuação: %d", pontuacoes[-1])
-            except Exception as e:
-                retry = True
-                logger.error(f"Erro ao extrair pontuação: {e}")
-
-            # tenta resetar para próxima partida
-            if not bot.reset():
-                logger.critical("Impossível reiniciar partida. Encerrando.")
-                exit(1)
-
-    # Monta dataframe e salva como batch temporário
-    df = pd.DataFrame(
-        {
-            "ocr": [ocr_method.name] * len(maiores_numeros),
-            "grade": [grade_method.name] * len(maiores_numeros),
-            "run_index": list(range(len(maiores_numeros))),
-            "maior_numero": maiores_numeros,
-            "pontuacao": pontuacoes,
-            "duracao": tempos_partida,
-        }
-    )
-    save_batch_temp(df, tag=f"ocr_{ocr_method.name}_grade_{grade_method.name}")
-    resultados_fase1.append(df)
+def jogar_partida(bot: Bot, fase: Fase) -> dict:
+    """Joga uma partida (repetindo se o board ou o score falharem) e mede
+    cada etapa
 
-# ---------- FASE 2: Teste heurística (100 partidas sem limite) ----------
-MAX_PARTIDAS = 100
-MAX_MOVIMENTOS = 9999
-
-bot = Bot(OCRMethod.EASYOCR_THREAD, GradeMethod.COR_FIXED)
-bot.start()
-bot.bot_ativo = True
-
-while not bot.is_active():
-    time.sleep(1)
-
-falhas_grid = 0
-maiores_numeros = []
-pontuacoes = []
-tempos_partida = []
-
-for partida in range(1, MAX_PARTIDAS + 1):
-    retry = True
-    while retry:
-        retry = False
-        logger.info(f"Partida {partida}/{MAX_PARTIDAS}")
-        board_final, falha, duracao = bot.run(MAX_MOVIMENTOS)
+    Returns:
+        dict: Resultado e tempos (s) da partida aceita
+    """
+    falhas_grid = 0
+    while True:
+        inicio = time.perf_counter()
+        board_final, falha, duracao = bot.run(fase.max_movimentos)
+        tempo_jogo = time.perf_counter() - inicio
+        # Por partida (também zera as listas do Think)
+        estatisticas = bot.think.estatisticas_busca() | bot.estatisticas_animacao()
         falhas_grid += falha
-        tempos_partida.append(duracao)
 
+        maior_numero = None
         if board_final is not None:
             try:
-                maiores_numeros.append(int(np.max(board_final)))
-                logger.info("Maior número alcançado: %d", maiores_numeros[-1])
+                maior_numero = int(np.max(board_final))
+                logger.info("Maior número alcançado: %d", maior_numero)
             except Exception as e:
-                retry = True
                 logger.error(f"Erro ao acessar board: {e}")
         else:
-            retry = True
             logger.error(f"Erro ao acessar board")
 
+        inicio = time.perf_counter()
+        pontuacao = None
         try:
-            pontuacoes.append(bot.sensor.extrair_score())
-            logger.info("Pontuação: %d", pontuacoes[-1])
+            pontuacao = bot.sensor.extrair_score()
+            if pontuacao < 0:
+                # Score ilegível (-1): a partida é repetida, não gravada
+                pontuacao = None
+            else:
+                logger.info("Pontuação: %d", pontuacao)
         except Exception as e:
-            retry = True
             logger.error(f"Erro ao extrair pontuação: {e}")
+        tempo_score = time.perf_counter() - inicio
 
+        # tenta resetar para próxima partida
+        inicio = time.perf_counter()
         if not bot.reset():
             logger.critical("Impossível reiniciar partida. Encerrando.")
             exit(1)
+        tempo_reset = time.perf_counter() - inicio
+
+        if maior_numero is not None and pontuacao is not None:
+            return {
+                "maior_numero": maior_numero,
+                "pontuacao": pontuacao,
+                "duracao": duracao,
+                "falhas_grid": falhas_grid,
+                "tempo_jogo": tempo_jogo,
+                "tempo_score": tempo_score,
+                "tempo_reset": tempo_reset,
+                **estatisticas,
+            }
+        logger.warning("Partida descartada, repetindo.")
+
+
+def rodar_combinacao(
+    resultados: Resultados,
+    fase: Fase,
+    ocr_method: OCRMethod,
+    grade_method: GradeMethod,
+    already_done: set,
+) -> None:
+    """Joga as partidas que faltam da combinação, gravando cada uma no stream
+    temporário assim que termina (uma queda perde no máximo a partida atual)"""
+    pendentes = [
+        run_index
+        for run_index in range(fase.partidas)
+        if (fase.nome, ocr_method.name, grade_method.name, run_index)
+        not in already_done
+    ]
+    if not pendentes:
+        logger.info(f"[SKIP] {fase.nome}: {ocr_method.name} + {grade_method.name}")
+        return
+    logger.info("Testando combinação: %s", (ocr_method.name, grade_method.name))
 
-df2 = pd.DataFrame(
-    {
-        "ocr": [OCRMethod.EASYOCR_THREAD.name] * len(maiores_numeros),
-        "grade": [GradeMethod.COR_FIXED.name] * len(maiores_numeros),
-        "run_index": list(range(len(maiores_numeros))),
-        "maior_numero": maiores_numeros,
-        "pontuacao": pontuacoes,
-        "duracao": tempos_partida,
-    }
-)
-save_batch_temp(df2, tag="think_phase")
+    inicio = time.perf_counter()
+    bot = Bot(ocr_method, grade_method, fase.move_strategy)
+    bot.start()
+    bot.bot_ativo = True
+    tempo_setup = time.perf_counter() - inicio
+    logger.info(f"Bot pronto em {tempo_setup:.2f}s")
+
+    with resultados.gravador(
+        tag=f"{fase.nome}_ocr_{ocr_method.name}_grade_{grade_method.name}"
+    ) as gravador:
+        for run_index in pendentes:
+            logger.info(f"Partida {run_index + 1}/{fase.partidas}")
+            gravador.append(
+                {
+                    "fase": fase.nome,
+                    "ocr": ocr_method.name,
+                    "grade": grade_method.name,
+                    "run_index": run_index,
+                    "max_movimentos": fase.max_movimentos,
+                    **jogar_partida(bot, fase),
+                    "tempo_setup": tempo_setup,
+                }
+            )
+            already_done.add((fase.nome, ocr_method.name, grade_method.name, run_index))
+    bot.think.close()
+
+
+def rodar(fases: list[Fase], resultados: Resultados) -> None:
+    already_done = resultados.build_already_done_set()
+    logger.info(f"{len(already_done)} partidas já gravadas")
+    for fase in fases:
+        inicio = time.perf_counter()
+        for ocr_method, grade_method in fase.combinacoes:
+            rodar_combinacao(resultados, fase, ocr_method, grade_method, already_done)
+        logger.info(
+            f"Fase {fase.nome} concluída em {time.perf_counter() - inicio:.0f}s"
+        )
+
+
+if __name__ == "__main__":
+    resultados = Resultados(OUTPUT_FILE, CHAVES, TEMP_BATCH_DIR)
+
+    # Leitor do EasyOCR carregado uma vez e compartilhado por todos os Bots
+    modelos.easyocr_reader(["pt"])
+
+    rodar(FASES, resultados)
+
+    # Acrescenta os streams temporários ao dataset final
+    try:
+        # O final de versões anteriores era um parquet único: vira pasta aqui
+        resultados.migrar_parquet_unico()
+        resultados.consolidate_all_to_final()
+        logger.info("Execução finalizada. Resultados consolidados.")
+    except Exception as e:
+        logger.error(f"Erro durante a consolidação final: {e}")
+        logger.info(
+            f"Os batches temporários ainda estão em {TEMP_BATCH_DIR}/ — você pode consolidá-los manualmente depois."
+        )
@@ -0,0 +1,116 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+
+import pandas as pd
+from core.game import Game2048
+from core.think import MoveStrategy, Think
+from logger_config import logger
+
+# ---------- Benchmark das estratégias no simulador (sem navegador) ----------
+N_PARTIDAS = 1000
+MAX_MOVIMENTOS: int | None = None  # None = joga até o fim
+PROFUNDIDADE = (
+    2  # Profundidade do expectimax (3 é o padrão do bot, mas ~10x mais lento)
+)
+WORKERS = os.cpu_count() or 1
+# As partidas já rodam em paralelo, então a busca paralela fica de fora
+ESTRATEGIAS = [MoveStrategy.MAIS_VAZIOS, MoveStrategy.EXPECTIMAX]
+
+RESULTADOS_DIR = Path("../resultados")
+OUTPUT_FILE = RESULTADOS_DIR / "resultados_headless_2048.parquet"
+
+# Um Think por processo e estratégia (evita recriar a cada partida)
+_thinks: dict[MoveStrategy, Think] = {}
+
+
+def jogar_partida(
+    strategy: MoveStrategy,
+    seed: int,
+    max_movimentos: int | None = None,
+    depth: int = PROFUNDIDADE,
+) -> dict:
+    """Joga uma partida completa no simulador
+
+    Args:
+        strategy (MoveStrategy): Estratégia de movimento
+        seed (int): Semente da partida
+        max_movimentos (int | None, optional): Limite de movimentos. Defaults to None.
+        depth (int, optional): Profundidade da busca. Defaults to PROFUNDIDADE.
+
+    Returns:
+        dict: Linha no mesmo formato de resultados_think_2048.parquet
+    """
+    if strategy not in _thinks:
+        _thinks[strategy] = Think(strategy, depth=depth)
+    think = _thinks[strategy]
+    think.set_depth(depth)
+    # Tabelas de transposição e contadores valem só dentro da partida
+    think.nova_partida()
+    think.estatisticas_busca()  # Descarta buscas de partidas anteriores
+
+    game = Game2048(seed)
+    inicio = time.perf_counter()
+    while max_movimentos is None or game.moves < max_movimentos:
+        move, _ = think.escolher_movimento(game.estado)
+        if move is None:
+            break
+        game.step(move)
+    tempo = time.perf_counter() - inicio
+
+    return {
+        "ocr": "HEADLESS",
+        "grade": "HEADLESS",
+        "falhas_grid": 0,
+        "maior_numero": game.max_tile,
+        "pontuacao": game.score,
+        "tempo": tempo,
+        "estrategia": strategy.name,
+        "seed": seed,
+        "movimentos": game.moves,
+        "movimentos_s": game.moves / tempo if tempo > 0 else 0.0,
+        **think.estatisticas_busca(),
+    }
+
+
+def benchmark(
+    strategy: MoveStrategy,
+    n_partidas: int,
+    max_movimentos: int | None = None,
+    workers: int = 1,
+) -> pd.DataFrame:
+    """Joga n_partidas com sementes 0..n-1 distribuídas em processos"""
+    jogar = partial(jogar_partida, strategy, max_movimentos=max_movimentos)
+    linhas = []
+    inicio = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for i, linha in enumerate(
+            executor.map(jogar, range(n_partidas), chunksize=8), start=1
+        ):
+            linhas.append(linha)
+            if i % 100 == 0 or i == n_partidas:
+                logger.info(
+                    f"[{strategy.name}] {i}/{n_partidas} partidas "
+                    f"({time.perf_counter() - inicio:.1f}s)"
+                )
+    return pd.DataFrame(linhas)
+
+
+if __name__ == "__main__":
+    RESULTADOS_DIR.mkdir(exist_ok=True)
+
+    dfs = []
+    for strategy in ESTRATEGIAS:
+        df = benchmark(strategy, N_PARTIDAS, MAX_MOVIMENTOS, WORKERS)
+        logger.info(
+            f"[{strategy.name}] maior número médio: {df['maior_numero'].mean():.0f} | "
+            f"pontuação média: {df['pontuacao'].mean():.0f} | "
+            f"movimentos/s: {df['movimentos_s'].mean():.0f}"
+        )
+        dfs.append(df)
+
+    df_final = pd.concat(dfs, ignore_index=True)
+    df_final.to_parquet(OUTPUT_FILE, index=False)
+    logger.info(f"Resultados salvos em {OUTPUT_FILE} ({len(df_final)} linhas)")
@@ -0,0 +1,41 @@
+import numpy as np
+from core.classificador import (
+    CLASSIFICADOR_PATH,
+    DATASET_DIR,
+    ClassificadorTiles,
+    carregar_dataset,
+)
+from logger_config import logger
+
+# ---------- Treino do classificador de tiles (leituras salvas pelo OCR) ----------
+EPOCAS = 1000
+FRACAO_VALIDACAO = 0.2
+SEED = 0
+
+if __name__ == "__main__":
+    imgs, valores = carregar_dataset(DATASET_DIR)
+    if not imgs:
+        raise SystemExit(
+            f"Nenhum tile rotulado em {DATASET_DIR}. Jogue algumas partidas com Bot(registrar_tiles=True) antes."
+        )
+    logger.info(f"{len(imgs)} tiles rotulados | classes: {np.unique(valores).tolist()}")
+
+    # Validação separada para estimar a acurácia fora do treino
+    ordem = np.random.default_rng(SEED).permutation(len(imgs))
+    n_validacao = int(len(imgs) * FRACAO_VALIDACAO)
+    validacao, treino = ordem[:n_validacao], ordem[n_validacao:]
+
+    modelo = ClassificadorTiles.treinar(
+        [imgs[i] for i in treino], valores[treino], epocas=EPOCAS
+    )
+    if n_validacao:
+        previstos, confiancas = modelo.prever([imgs[i] for i in validacao])
+        logger.info(
+            f"Acurácia de validação: {np.mean(previstos == valores[validacao]):.2%} | "
+            f"confiança média: {confiancas.mean():.2f}"
+        )
+
+    # Modelo final com todos os exemplos
+    modelo = ClassificadorTiles.treinar(imgs, valores, epocas=EPOCAS)
+    modelo.save(CLASSIFICADOR_PATH)
+    logger.info(f"Classificador salvo em {CLASSIFICADOR_PATH}")
@@ -0,0 +1,87 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+from core.game import Game2048
+from core.ntuple import NTUPLE_PATH, NTupleNetwork
+from logger_config import logger
+
+# ---------- Treino da rede de N-tuplas por autojogo (TD, só CPU) ----------
+EPOCAS = 100
+PARTIDAS_POR_WORKER = 200  # Partidas de cada processo por época
+ALPHA = 0.1  # Taxa de aprendizado (dividida entre as 40 features)
+WORKERS = os.cpu_count() or 1
+CONTINUAR = True  # Parte dos pesos salvos, se existirem
+SALVAR_A_CADA = 10  # Épocas entre gravações do .npy (e sempre na última)
+OUTPUT_FILE: Path = NTUPLE_PATH
+
+
+def treinar_worker(
+    pesos: np.ndarray, n_partidas: int, alpha: float, seed: int
+) -> tuple[np.ndarray, list[int], list[int]]:
+    """Treina uma cópia da rede em n_partidas de autojogo
+
+    Returns:
+        tuple[np.ndarray, list[int], list[int]]: Pesos finais, pontuações e
+        maiores tiles das partidas
+    """
+    rede = NTupleNetwork(pesos)
+    pontuacoes, maiores = [], []
+    for i in range(n_partidas):
+        game = Game2048(seed + i)
+        rede.treinar_partida(game, alpha)
+        pontuacoes.append(game.score)
+        maiores.append(game.max_tile)
+    return rede.pesos, pontuacoes, maiores
+
+
+def treinar(
+    epocas: int = EPOCAS,
+    partidas: int = PARTIDAS_POR_WORKER,
+    alpha: float = ALPHA,
+    workers: int = WORKERS,
+    output: Path = OUTPUT_FILE,
+) -> NTupleNetwork:
+    """Cada época roda um lote de partidas por processo, a partir dos mesmos
+    pesos, e faz a média dos pesos resultantes (média de modelos)"""
+    if CONTINUAR and Path(output).exists():
+        rede = NTupleNetwork.load(output)
+        logger.info(f"Continuando o treino de {output}")
+    else:
+        rede = NTupleNetwork()
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for epoca in range(1, epocas + 1):
+            inicio = time.perf_counter()
+            pesos = rede.pesos
+            seeds = [(epoca * workers + w) * partidas for w in range(workers)]
+            resultados = list(
+                executor.map(
+                    treinar_worker,
+                    [pesos] * workers,
+                    [partidas] * workers,
+                    [alpha] * workers,
+                    seeds,
+                )
+            )
+
+            rede = NTupleNetwork(np.mean([r[0] for r in resultados], axis=0))
+            if epoca % SALVAR_A_CADA == 0 or epoca == epocas:
+                rede.save(output)
+
+            pontuacoes = [p for r in resultados for p in r[1]]
+            maiores = np.array([m for r in resultados for m in r[2]])
+            logger.info(
+                f"Época {epoca}/{epocas} | pontuação média: {np.mean(pontuacoes):.0f} | "
+                f"2048+: {np.mean(maiores >= 2048):.1%} | "
+                f"maior número: {maiores.max()} | "
+                f"{time.perf_counter() - inicio:.1f}s"
+            )
+    return rede
+
+
+if __name__ == "__main__":
+    treinar()
+    logger.info(f"Pesos salvos em {OUTPUT_FILE}")
@@ -0,0 +1,6 @@
+"""Módulos usados por mais de um projeto (2048, distrocards, taisei-project).
+
+Cada projeto continua rodando da própria pasta; o script de entrada (main.py)
+põe a raiz do repositório no sys.path antes de importar bot/core. Os módulos
+logam em logging.getLogger(__name__) e não dependem de nenhum projeto.
+"""
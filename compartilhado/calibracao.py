@@ -0,0 +1,103 @@
+"""Calibração persistida: regiões, grades e posições de templates já detectadas.
+
+As entradas ficam em um JSON, separadas por jogo e tamanho da janela, com
+coordenadas relativas à janela (mover a janela não invalida a calibração).
+Quem usa uma entrada deve validá-la em um quadro antes de confiar nela.
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import Any
+
+import cv2
+
+logger = logging.getLogger(__name__)
+
+CALIBRACAO_PATH = Path("cache") / "calibracao.json"
+# Tolerância (px) ao reaproveitar a posição calibrada de um template
+MARGEM_CALIBRACAO = 10
+
+
+class Calibracao:
+    def __init__(
+        self, jogo: str, janela: dict[str, int], path: Path = CALIBRACAO_PATH
+    ) -> None:
+        """Entradas de calibração de um jogo em uma janela
+
+        Args:
+            jogo (str): Nome do jogo
+            janela (dict[str, int]): Região da janela (só o tamanho entra na chave)
+            path (Path, optional): Arquivo JSON. Defaults to CALIBRACAO_PATH.
+        """
+        self.path = path
+        self.chave = f"{jogo} {janela['width']}x{janela['height']}"
+        self.todas: dict[str, dict[str, Any]] = self._ler()
+        self.dados = self.todas.setdefault(self.chave, {})
+
+    def _ler(self) -> dict[str, dict[str, Any]]:
+        if not self.path.exists():
+            return {}
+        try:
+            return json.loads(self.path.read_text())
+        except (OSError, ValueError) as e:
+            logger.warning(f"Calibração ignorada ({self.path}): {e}")
+            return {}
+
+    def get(self, nome: str) -> Any | None:
+        return self.dados.get(nome)
+
+    def set(self, nome: str, valor: Any) -> None:
+        """Guarda a entrada (e grava o arquivo se ela mudou)"""
+        valor = json.loads(json.dumps(valor))  # tuplas -> listas, como no arquivo
+        if self.dados.get(nome) != valor:
+            self.dados[nome] = valor
+            self.salvar()
+
+    def remover(self, nome: str) -> None:
+        if self.dados.pop(nome, None) is not None:
+            logger.info(f"Calibração '{nome}' descartada")
+            self.salvar()
+
+    def salvar(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp = self.path.with_suffix(".tmp")
+        temp.write_text(json.dumps(self.todas, indent=2))
+        temp.replace(self.path)
+
+    def localizar_template(
+        self,
+        screenshot: cv2.typing.MatLike,
+        template: cv2.typing.MatLike,
+        template_name: str,
+        threshold: float = 0.8,
+    ) -> tuple[float, tuple[int, int]]:
+        """Template matching que tenta primeiro a posição calibrada
+
+        Busca só em volta da última posição encontrada; se não passar do
+        threshold, busca na janela inteira e calibra a nova posição.
+
+        Returns:
+            tuple[float, tuple[int, int]]: Similaridade e posição (x, y) na janela
+        """
+        h, w = template.shape[:2]
+        chave = f"template_{template_name}"
+        salvo = self.get(chave)
+        if salvo:
+            x0 = max(0, salvo[0] - MARGEM_CALIBRACAO)
+            y0 = max(0, salvo[1] - MARGEM_CALIBRACAO)
+            recorte = screenshot[
+                y0 : salvo[1] + h + MARGEM_CALIBRACAO,
+                x0 : salvo[0] + w + MARGEM_CALIBRACAO,
+            ]
+            if recorte.shape[0] >= h and recorte.shape[1] >= w:
+                result = cv2.matchTemplate(recorte, template, cv2.TM_CCOEFF_NORMED)
+                _, max_val, _, max_loc = cv2.minMaxLoc(result)
+                if max_val >= threshold:
+                    return max_val, (x0 + max_loc[0], y0 + max_loc[1])
+
+        result = cv2.matchTemplate(screenshot, template, cv2.TM_CCOEFF_NORMED)
+        _, max_val, _, max_loc = cv2.minMaxLoc(result)
+        if max_val >= threshold:
+            self.set(chave, max_loc)
+        return max_val, max_loc
@@ -0,0 +1,72 @@
+"""Registro de modelos pesados (leitores do EasyOCR, pesos do YOLO) por processo.
+
+Cada modelo é carregado na primeira vez que alguém pede e reaproveitado por
+todos os Bots/Sensors seguintes, em vez de um novo carregamento por instância.
+O tempo de carga de cada um fica em tempos_carga.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Hashable
+
+logger = logging.getLogger(__name__)
+
+_modelos: dict[Hashable, Any] = {}
+_lock = threading.Lock()
+tempos_carga: dict[str, float] = {}
+
+
+def obter(chave: Hashable, carregar: Callable[[], Any]) -> Any:
+    """Devolve o modelo da chave, carregando-o só na primeira chamada
+
+    Args:
+        chave (Hashable): Identificação do modelo (tipo e parâmetros)
+        carregar (Callable[[], Any]): Função que carrega o modelo
+
+    Returns:
+        Any: Modelo compartilhado
+    """
+    modelo = _modelos.get(chave)
+    if modelo is not None:
+        return modelo
+    with _lock:
+        if chave not in _modelos:
+            inicio = time.perf_counter()
+            _modelos[chave] = carregar()
+            tempos_carga[str(chave)] = time.perf_counter() - inicio
+            logger.info(f"Modelo {chave} carregado em {tempos_carga[str(chave)]:.2f}s")
+        return _modelos[chave]
+
+
+def easyocr_reader(idiomas: list[str], gpu: bool = True) -> Any:
+    """Leitor do EasyOCR compartilhado para os idiomas"""
+
+    def carregar():
+        import easyocr
+
+        return easyocr.Reader(idiomas, gpu=gpu)
+
+    return obter(("easyocr", tuple(idiomas), gpu), carregar)
+
+
+def yolo(path: str) -> Any:
+    """Modelo YOLO compartilhado para o arquivo de pesos"""
+
+    def carregar():
+        from ultralytics import YOLO
+
+        return YOLO(path)
+
+    return obter(("yolo", str(path)), carregar)
+
+
+def carregados() -> list[Hashable]:
+    return list(_modelos)
+
+
+def descarregar() -> None:
+    """Esquece os modelos (o próximo pedido carrega de novo)"""
+    with _lock:
+        _modelos.clear()
+        tempos_carga.clear()
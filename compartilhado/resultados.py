@@ -0,0 +1,352 @@
+"""Resultados de experimentos em Arrow/parquet, retomáveis após uma interrupção.
+
+As linhas são gravadas assim que ficam prontas, por um Gravador, em um
+stream Arrow IPC temporário (um record batch por grupo de linhas; um stream
+cortado no meio continua legível até o último batch completo). A
+consolidação transforma cada stream em uma parte do dataset parquet final
+(uma pasta), sem reler os dados que já estavam lá. Todas as partes ficam com
+o mesmo schema (tipos divergentes são promovidos, int → double), então a
+pasta é lida normalmente por pd.read_parquet. Ao reiniciar, as chaves já
+presentes são puladas.
+
+Batches temporários .parquet de versões anteriores continuam sendo lidos e
+consolidados; um final em parquet único só vira pasta por
+migrar_parquet_unico().
+"""
+
+import logging
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+EXTENSAO_STREAM = ".arrows"
+EXTENSAO_LEGADO = ".parquet"
+
+
+def _ler_stream(path: Path) -> pa.Table:
+    """Lê os record batches completos do stream (ignora um final truncado)"""
+    batches = []
+    with pa.OSFile(str(path)) as arquivo:
+        leitor = pa.ipc.open_stream(arquivo)
+        try:
+            for batch in leitor:
+                batches.append(batch)
+        except (pa.ArrowInvalid, OSError) as e:
+            logger.warning(f"Batch {path.name} truncado, usando {len(batches)}: {e}")
+    return pa.Table.from_batches(batches, schema=leitor.schema)
+
+
+def _ler_batch(path: Path) -> pa.Table:
+    """Lê um batch temporário (stream Arrow ou parquet de versões anteriores)"""
+    if path.suffix == EXTENSAO_LEGADO:
+        logger.warning(f"Batch {path.name} no formato parquet antigo")
+        return pq.read_table(path)
+    return _ler_stream(path)
+
+
+def _juntar(tabelas: list[pa.Table]) -> pd.DataFrame:
+    """Concatena tabelas promovendo tipos divergentes (int → double, null → tipo)"""
+    if not tabelas:
+        return pd.DataFrame()
+    return pa.concat_tables(tabelas, promote_options="permissive").to_pandas()
+
+
+def _conformar(tabela: pa.Table, schema: pa.Schema) -> pa.Table:
+    """Converte a tabela para o schema (colunas ausentes viram nulas)"""
+    colunas = [
+        (
+            tabela.column(campo.name).cast(campo.type)
+            if campo.name in tabela.column_names
+            else pa.nulls(tabela.num_rows, campo.type)
+        )
+        for campo in schema
+    ]
+    return pa.Table.from_arrays(colunas, schema=schema)
+
+
+class Gravador:
+    def __init__(
+        self,
+        path: Path,
+        linhas_por_grupo: int = 1,
+        schema: pa.Schema | None = None,
+    ) -> None:
+        """Escreve linhas em um stream Arrow IPC aberto, um grupo por vez
+
+        Sem schema explícito, ele é inferido de cada grupo e unificado com o
+        anterior (int vira double, coluna nula ganha o tipo que aparecer);
+        quando muda, o stream atual é fechado e as linhas seguem em um novo
+        (<nome>_<n>), já que um stream tem um schema só. A consolidação
+        converte os streams para um schema comum. Cada grupo é gravado e
+        enviado ao disco antes de append() retornar.
+
+        Args:
+            path (Path): Arquivo do (primeiro) stream
+            linhas_por_grupo (int, optional): Linhas por record batch.
+                Defaults to 1 (cada linha vai para o disco na hora).
+            schema (pa.Schema | None, optional): Schema fixo das linhas.
+                Defaults to None (inferido).
+        """
+        self.path = path
+        self.linhas_por_grupo = linhas_por_grupo
+        self.schema_fixo = schema
+        self.pendentes: list[dict[str, Any]] = []
+        self.linhas = 0
+        self.paths: list[Path] = []
+        self.schema: pa.Schema | None = None
+        self.arquivo: pa.OSFile | None = None
+        self.writer: pa.ipc.RecordBatchStreamWriter | None = None
+
+    def append(self, linha: dict[str, Any]) -> None:
+        self.pendentes.append(linha)
+        if len(self.pendentes) >= self.linhas_por_grupo:
+            self.flush()
+
+    def extend(self, linhas: list[dict[str, Any]]) -> None:
+        """Acrescenta várias linhas de uma vez (no mesmo grupo, se couberem)"""
+        self.pendentes.extend(linhas)
+        if len(self.pendentes) >= self.linhas_por_grupo:
+            self.flush()
+
+    def _abrir(self, schema: pa.Schema) -> None:
+        """Fecha o stream atual (se houver) e abre um novo com o schema"""
+        self._fechar()
+        path = self.path
+        if self.paths:
+            path = path.with_name(f"{path.stem}_{len(self.paths)}{EXTENSAO_STREAM}")
+        self.paths.append(path)
+        self.schema = schema
+        self.arquivo = pa.OSFile(str(path), "wb")
+        self.writer = pa.ipc.new_stream(self.arquivo, schema)
+
+    def _fechar(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+            self.arquivo.close()
+            self.writer = None
+
+    def flush(self) -> None:
+        if not self.pendentes:
+            return
+        schema = self.schema_fixo
+        if schema is None:
+            schema = pa.RecordBatch.from_pylist(self.pendentes).schema
+            if self.schema is not None:
+                schema = pa.unify_schemas(
+                    [self.schema, schema], promote_options="permissive"
+                )
+        if schema != self.schema:
+            self._abrir(schema)
+        batch = pa.RecordBatch.from_pylist(self.pendentes, schema=self.schema)
+        self.writer.write_batch(batch)
+        self.arquivo.flush()
+        self.linhas += len(self.pendentes)
+        self.pendentes.clear()
+
+    def close(self) -> None:
+        self.flush()
+        if self.writer is not None:
+            self._fechar()
+            logger.info(
+                f"Batch temporário salvo: {self.path.name} ({self.linhas} linhas)"
+            )
+
+    def __enter__(self) -> "Gravador":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class Resultados:
+    def __init__(
+        self,
+        output_file: Path,
+        chaves: list[str] | None = None,
+        temp_dir: Path | None = None,
+    ) -> None:
+        """Dataset parquet final e streams temporários de um experimento
+
+        Args:
+            output_file (Path): Pasta do dataset final (um parquet único de
+                versões anteriores é lido, mas só convertido por
+                migrar_parquet_unico())
+            chaves (list[str] | None, optional): Colunas que identificam uma
+                execução já feita. Defaults to None (não pula nada).
+            temp_dir (Path | None, optional): Pasta dos streams temporários.
+                Defaults to <pasta do final>/temp_batches/<nome do final>.
+        """
+        self.output_file = Path(output_file)
+        self.temp_dir = temp_dir or (
+            self.output_file.parent / "temp_batches" / self.output_file.stem
+        )
+        self.chaves = chaves or []
+        self.temp_dir.mkdir(parents=True, exist_ok=True)
+
+    def migrar_parquet_unico(self) -> None:
+        """Move o parquet único de versões anteriores para dentro da pasta do
+        dataset, como primeira parte (sem efeito se já for pasta)"""
+        if not self.output_file.is_file():
+            return
+        antigo = self.output_file.with_name(self.output_file.name + ".old")
+        self.output_file.replace(antigo)
+        self.output_file.mkdir()
+        antigo.replace(self.output_file / "part-000000.parquet")
+        logger.info(f"{self.output_file.name} convertido para dataset (pasta)")
+
+    def load_final_results(self) -> pd.DataFrame:
+        """Carrega o dataset final (pasta ou parquet único), se existir."""
+        if self.output_file.is_file():
+            partes = [self.output_file]
+        else:
+            partes = sorted(self.output_file.glob("*.parquet"))
+        if partes:
+            try:
+                # Datasets consolidados antes do schema comum podem ter partes
+                # com tipos diferentes
+                df = _juntar([pq.read_table(p) for p in partes])
+                logger.info(
+                    f"Carregado {len(df)} resultados do {self.output_file.name}"
+                )
+                return df
+            except Exception as e:
+                logger.error(f"Falha ao ler {self.output_file}: {e}")
+        return pd.DataFrame()
+
+    def list_temp_batches(self) -> list[Path]:
+        """Retorna lista de batches temporários (streams e parquets antigos)."""
+        return sorted(
+            p
+            for extensao in (EXTENSAO_STREAM, EXTENSAO_LEGADO)
+            for p in self.temp_dir.glob(f"*{extensao}")
+        )
+
+    def load_all_progress(self) -> pd.DataFrame:
+        """Final (se houver) mais todos os temporários, para continuar mesmo
+        sem ter consolidado ainda."""
+        dfs = []
+        df_final = self.load_final_results()
+        if not df_final.empty:
+            dfs.append(df_final)
+
+        for p in self.list_temp_batches():
+            try:
+                dfs.append(_ler_batch(p).to_pandas())
+            except Exception as e:
+                logger.error(f"Não foi possível ler batch {p.name}: {e}")
+
+        dfs = [df for df in dfs if not df.empty]
+        if dfs:
+            return pd.concat(dfs, ignore_index=True)
+        return pd.DataFrame()
+
+    def gravador(
+        self,
+        tag: str | None = None,
+        linhas_por_grupo: int = 1,
+        schema: pa.Schema | None = None,
+    ) -> Gravador:
+        """Abre um stream temporário identificado por tag+uuid
+
+        Args:
+            tag (str | None, optional): Prefixo do nome. Defaults to "batch".
+            linhas_por_grupo (int, optional): Linhas por record batch. Defaults to 1.
+            schema (pa.Schema | None, optional): Schema fixo. Defaults to None.
+        """
+        timestamp = datetime.now().strftime("%Y%m%dT%H%M%S")
+        uid = uuid.uuid4().hex[:8]
+        path = self.temp_dir / f"{tag or 'batch'}_{timestamp}_{uid}{EXTENSAO_STREAM}"
+        return Gravador(path, linhas_por_grupo, schema)
+
+    def consolidate_all_to_final(self, substituir: bool = False) -> None:
+        """Acrescenta cada batch temporário ao dataset final como uma parte
+        nova (só as linhas novas são escritas) e apaga o batch.
+
+        As partes novas e as que já estavam no dataset ficam com um schema
+        só (os tipos divergentes são promovidos). Uma parte antiga só é
+        regravada se o tipo de alguma coluna dela precisar ser promovido.
+
+        Args:
+            substituir (bool, optional): Apaga as partes anteriores depois de
+                gravar as novas (o dataset fica só com estes batches).
+                Defaults to False.
+
+        Raises:
+            FileExistsError: Final ainda em parquet único (sem substituir)
+        """
+        logger.info("Consolidando batches temporários no dataset final...")
+        batches = self.list_temp_batches()
+        if not batches:
+            logger.info("Nada para consolidar.")
+            return
+
+        if self.output_file.is_file():
+            if not substituir:
+                raise FileExistsError(
+                    f"{self.output_file} é um parquet único; "
+                    "chame migrar_parquet_unico() antes de consolidar"
+                )
+            self.output_file.unlink()
+        self.output_file.mkdir(parents=True, exist_ok=True)
+        gravadas = {self.output_file / f"{p.stem}.parquet" for p in batches}
+        novas: dict[Path, pa.Table] = {}
+        for p in batches:
+            parte = self.output_file / f"{p.stem}.parquet"
+            # Parte já gravada (queda entre a gravação e a remoção do batch)
+            if not parte.exists():
+                tabela = _ler_batch(p)
+                if tabela.num_rows:
+                    novas[parte] = tabela
+        existentes = sorted(
+            parte
+            for parte in self.output_file.glob("*.parquet")
+            if not substituir or parte in gravadas
+        )
+
+        # Um schema para o dataset inteiro, para o pd.read_parquet ler a pasta
+        schemas = [pq.read_schema(parte) for parte in existentes]
+        schemas += [tabela.schema for tabela in novas.values()]
+        if schemas:
+            schema = pa.unify_schemas(schemas, promote_options="permissive")
+            for parte, schema_parte in zip(existentes, schemas):
+                if not schema_parte.equals(schema):
+                    logger.info(f"Parte {parte.name} convertida para o novo schema")
+                    self._gravar_parte(_conformar(pq.read_table(parte), schema), parte)
+            for parte, tabela in novas.items():
+                self._gravar_parte(_conformar(tabela, schema), parte)
+
+        for p in batches:
+            try:
+                p.unlink()
+            except Exception:
+                logger.warning(f"Não foi possível apagar batch {p.name}")
+        if substituir:
+            for antiga in set(self.output_file.glob("*.parquet")) - gravadas:
+                antiga.unlink()
+        linhas = sum(tabela.num_rows for tabela in novas.values())
+        logger.info(f"{linhas} linhas acrescentadas em {self.output_file.name}")
+
+    def _gravar_parte(self, tabela: pa.Table, parte: Path) -> None:
+        """Escrita atômica: grava ao lado e só então move para o dataset"""
+        temp = self.temp_dir / f"{parte.stem}.parquet.tmp"
+        pq.write_table(tabela, temp)
+        temp.replace(parte)
+
+    def build_already_done_set(self, df_progress: pd.DataFrame | None = None) -> set:
+        """Chaves já processadas (lê o progresso se o dataframe não for dado)"""
+        if df_progress is None:
+            df_progress = self.load_all_progress()
+        if (
+            not self.chaves
+            or df_progress.empty
+            or not set(self.chaves) <= set(df_progress.columns)
+        ):
+            return set()
+        return set(zip(*(df_progress[c] for c in self.chaves)))
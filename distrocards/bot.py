@@ -10,12 +10,20 @@ from logger_config import logger
 
 
 class Bot:
-    def __init__(self, card_detection, pair_strategy, hotkey="F8"):
+    def __init__(
+        self,
+        card_detection,
+        pair_strategy,
+        hotkey="F8",
+        reutilizar_layout: bool = False,  # Layout das cartas calibrado
+    ):
         self.hotkey = hotkey
         self.bot_ativo = False
 
         # Componentes principais
-        self.sensor = Sensor("DistroCards", card_detection)
+        self.sensor = Sensor(
+            "DistroCards", card_detection, reutilizar_layout=reutilizar_layout
+        )
         self.think = Think(pair_strategy)
         self.act = Act(self.sensor.region)
 
@@ -5,3 +5,6 @@ RED = (0, 0, 255)
 BLACK = (0, 0, 0)
 WHITE = (255, 255, 255)
 GRAY = (128, 128, 128)
+
+# Similaridade mínima com o verso para validar as cartas calibradas
+LIMIAR_VERSO = 0.8
@@ -7,7 +7,10 @@ import mss
 import numpy as np
 import pygetwindow as gw
 from core import debug
-from core.constants import GREEN, RED
+from core.constants import GREEN, LIMIAR_VERSO, RED
+from logger_config import logger
+
+from compartilhado.calibracao import Calibracao
 
 
 class Difficulty(Enum):
@@ -38,13 +41,19 @@ class Sensor:
         window_name: str,
         card_detection: CardDetection,
         difficulty: Difficulty = Difficulty.EASY,
+        reutilizar_layout: bool = False,
     ) -> None:
         self.region = self.get_window(window_name)
         self.difficulty = difficulty
+        # Reaproveita o layout das cartas calibrado (desligado no benchmark)
+        self.reutilizar_layout = reutilizar_layout
         self.sct = mss.mss()
+        # Layout das cartas e posições de templates de execuções anteriores
+        self.calibracao = Calibracao("DistroCards", self.region)
         self.set_card_detection(card_detection)
 
     def set_card_detection(self, card_detection: CardDetection):
+        self.card_detection_method = card_detection
         self.card_detection = {
             CardDetection.COR: self._detectar_cards_cor,
             CardDetection.TEMPLATE: self._detectar_cards_template,
@@ -111,8 +120,9 @@ class Sensor:
         if template is None:
             raise FileNotFoundError(f"Template não encontrado: {template_name}")
 
-        result = cv2.matchTemplate(screenshot, template, cv2.TM_CCOEFF_NORMED)
-        _, max_val, _, max_loc = cv2.minMaxLoc(result)
+        max_val, max_loc = self.calibracao.localizar_template(
+            screenshot, template, template_name, threshold
+        )
 
         if max_val >= threshold:
             template_h, template_w = template.shape[:2]
@@ -132,7 +142,49 @@ class Sensor:
             return None
 
     def get_cards(self) -> list[Card]:
-        return self.card_detection()
+        """Retorna as cartas da mesa
+
+        Com reutilizar_layout, reaproveita o layout calibrado para a
+        dificuldade se todas as posições ainda mostram o verso.
+        """
+        if not self.reutilizar_layout:
+            return self.card_detection()
+
+        chave = f"cards_{self.difficulty.name}_{self.card_detection_method.name}"
+        salvo = self.calibracao.get(chave)
+        if salvo:
+            cards = [Card(*c) for c in salvo]
+            if self._validar_cards(cards):
+                logger.info(f"Layout calibrado reutilizado ({len(cards)} cartas)")
+                return cards
+            logger.warning("Layout calibrado não confere, detectando novamente")
+            self.calibracao.remover(chave)
+
+        cards = self.card_detection()
+        if cards:
+            self.calibracao.set(chave, cards)
+        return cards
+
+    def _validar_cards(self, cards: list[Card]) -> bool:
+        """Confere em um quadro se todas as cartas estão viradas (verso)
+
+        Args:
+            cards (list[Card]): Cartas calibradas
+
+        Returns:
+            bool: True se todas as posições mostram o verso
+        """
+        screenshot = self.get_screenshot()
+        verso = self.get_template_verso()
+        for card in cards:
+            img = screenshot[card.y : card.y + card.h, card.x : card.x + card.w]
+            if img.shape[:2] != (card.h, card.w):
+                return False
+            verso_resized = cv2.resize(verso, (card.w, card.h))
+            result = cv2.matchTemplate(img, verso_resized, cv2.TM_CCOEFF_NORMED)
+            if result.max() < LIMIAR_VERSO:
+                return False
+        return True
 
     def capturar_carta(self, card: Card):
         screenshot = self.get_screenshot()
@@ -1,10 +1,15 @@
 from __future__ import annotations
 
 import logging
+import sys
 import time
 from pathlib import Path
 from typing import TYPE_CHECKING, Type
 
+# Raiz do repositório no sys.path: bot/core e os módulos abaixo importam o
+# pacote compartilhado/ (o script roda de dentro da pasta do projeto)
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
 import numpy as np
 import pandas as pd
 import pyautogui
@@ -13,6 +18,8 @@ from core.sensor import CardDetection
 from core.think import PairStrategy
 from logger_config import logger
 
+from compartilhado.resultados import Gravador, Resultados
+
 if TYPE_CHECKING:
     from enum import Enum
     from types import FunctionType
@@ -53,6 +60,7 @@ def medir_tempos_pair(
     difficulty: Difficulty,
     threshold: float,
     n: int = 20,
+    gravador: Gravador | None = None,
 ) -> pd.DataFrame:
     dados = []
 
@@ -79,7 +87,7 @@ def medir_tempos_pair(
             logger.error(e)
 
         total_calls = len(bot.think.pair_times)
-        media_tempo = np.mean(bot.think.pair_times) if bot.think.pair_times else 0
+        media_tempo = np.mean(bot.think.pair_times) if bot.think.pair_times else 0.0
         acertos = bot.think.pair_hits
         erros = bot.think.pair_errors
 
@@ -97,6 +105,9 @@ def medir_tempos_pair(
                 "num_cartas": num_cartas,
             }
         )
+        # Grava cada iteração assim que termina
+        if gravador is not None:
+            gravador.append(dados[-1])
 
     return pd.DataFrame(dados)
 
@@ -107,15 +118,14 @@ def run_tests(
     file_name: str,
     enum: Type[Enum],
 ):
-    dfs = []
-    for metodo in enum:
-        for dificuldade in Difficulty:
-            df_temp = func(bot, metodo, dificuldade)
-            dfs.append(df_temp)
-
-    df_final = pd.concat(dfs, ignore_index=True)
-    df_final.to_parquet(RESULTADOS_DIR / file_name, index=False)
-    df_final.head()
+    resultados = Resultados(RESULTADOS_DIR / file_name)
+    with resultados.gravador(tag=Path(file_name).stem) as gravador:
+        for metodo in enum:
+            for dificuldade in Difficulty:
+                df_temp = func(bot, metodo, dificuldade)
+                gravador.extend(df_temp.to_dict("records"))
+    # Cada chamada refaz o teste inteiro: o arquivo fica só com esta execução
+    resultados.consolidate_all_to_final(substituir=True)
 
 
 if __name__ == "__main__":
@@ -124,25 +134,24 @@ if __name__ == "__main__":
         time.sleep(1)
     # bot.start(Difficulty.HARD)
     # bot.run()
-    dfs = []
+    resultados = Resultados(
+        RESULTADOS_DIR / "resultados_think_distrocards_quality_hard.parquet"
+    )
 
     test_plan = [
         (Difficulty.EASY, 0.80),  # Fácil   → 80 %
         (Difficulty.HARD, 0.98),  # Difícil → 98 %
         (Difficulty.HARD, 0.95),  # Difícil → 95 %
     ]
-    for dificuldade, threshold in test_plan:
-        for metodo in PairStrategy:
-            df_temp = medir_tempos_pair(bot, metodo, dificuldade, threshold, 50)
-            dfs.append(df_temp)
-
-    df_final = pd.concat(dfs, ignore_index=True)
-    destino = RESULTADOS_DIR / "resultados_think_distrocards_quality_hard.parquet"
-    if destino.exists():
-        df_antigo = pd.read_parquet(destino)
-        df_final = pd.concat([df_antigo, df_final], ignore_index=True)
-    df_final.to_parquet(destino, index=False)
-    print(df_final.head())
+    # As linhas novas são acrescentadas ao dataset, sem reler as antigas
+    with resultados.gravador(tag="quality_hard") as gravador:
+        for dificuldade, threshold in test_plan:
+            for metodo in PairStrategy:
+                medir_tempos_pair(bot, metodo, dificuldade, threshold, 50, gravador)
+    # O final de versões anteriores era um parquet único: vira pasta aqui
+    resultados.migrar_parquet_unico()
+    resultados.consolidate_all_to_final()
+    print(resultados.load_final_results().head())
 
     # run_tests(
     #     bot,
@@ -12,7 +12,8 @@ import numpy as np
 import pygetwindow as gw
 from core import debug
 from logger_config import logger
-from ultralytics import YOLO
+
+from compartilhado import modelos
 
 
 class Difficulty(Enum):
@@ -70,7 +71,7 @@ class Sensor:
         self.region = self.get_window(window_name)
         self.difficulty = difficulty
         self.sct = mss.mss()
-        self.model = YOLO(self.MODEL_PATH)
+        self.model = modelos.yolo(self.MODEL_PATH)
         debug.debug_img = self.get_screenshot()
         debug.debug_show()
         logger.info("Janela aberta. Posicione no segundo monitor.")
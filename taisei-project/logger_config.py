@@ -28,3 +28,11 @@ def setup_logger(nome_log: str = "BOT", log_file: str = "bot.log") -> logging.Lo
 
 
 logger = setup_logger()
+
+# O pacote compartilhado/ loga em logging.getLogger(__name__): suas mensagens
+# saem nos mesmos handlers (console e arquivo) do projeto
+compartilhado = logging.getLogger("compartilhado")
+compartilhado.setLevel(logging.INFO)
+compartilhado.propagate = False
+for handler in logger.handlers:
+    compartilhado.addHandler(handler)
@@ -1,18 +1,23 @@
 import logging
 import statistics
+import sys
 import time
-import uuid
 from collections import deque
 from datetime import datetime, timedelta
 from pathlib import Path
 
+# Raiz do repositório no sys.path: bot/core e os módulos abaixo importam o
+# pacote compartilhado/ (o script roda de dentro da pasta do projeto)
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
 import cv2
-import easyocr
-import pandas as pd
 from bot import Bot
 from core.think import DodgeStrategy
 from logger_config import logger
 
+from compartilhado import modelos
+from compartilhado.resultados import Resultados
+
 # =======================================
 # CONFIGURAÇÃO DE LOGGER E DIRETÓRIOS
 # =======================================
@@ -25,7 +30,12 @@ TEMP_BATCH_DIR = RESULTADOS_DIR / "temp_batches"
 TEMP_BATCH_DIR.mkdir(exist_ok=True)
 
 OUTPUT_FILE = RESULTADOS_DIR / "resultados_dodge_final.parquet"
-TEMP_MERGE_FILE = RESULTADOS_DIR / "resultados_dodge_final.parquet.tmp"
+# Streams temporários + dataset final (mesma lógica do 2048/main.py)
+resultados = Resultados(
+    OUTPUT_FILE,
+    chaves=["strategy", "run_index", "bomb", "travel_time", "cell_size"],
+    temp_dir=TEMP_BATCH_DIR,
+)
 SCORE_ROI = (1429, 107, 231, 58)
 
 # =======================================
@@ -37,11 +47,6 @@ SKIPPED_RUNS = 0
 START_TIME = None
 RUN_TIMES = deque(maxlen=25)  # Média móvel de execuções recentes
 
-# =======================================
-# OCR READER
-# =======================================
-reader = easyocr.Reader(["en"], gpu=True)
-
 
 # =======================================
 # FUNÇÕES DE OCR
@@ -52,6 +57,7 @@ def ocr_score(bot: Bot) -> int:
     x, y, w, h = SCORE_ROI
     cropped = screenshot[y : y + h, x : x + w]
 
+    reader = modelos.easyocr_reader(["en"], gpu=True)
     result = reader.readtext(cropped, detail=0, paragraph=False)
     for r in result:
         r_clean = r.replace(",", "").replace(" ", "")
@@ -60,154 +66,6 @@ def ocr_score(bot: Bot) -> int:
     return 0
 
 
-# =======================================
-# FUNÇÕES DE CARREGAMENTO DE RESULTADOS
-# =======================================
-def load_final_results() -> pd.DataFrame:
-    """Carrega o parquet final, se existir."""
-    if OUTPUT_FILE.exists():
-        try:
-            df = pd.read_parquet(OUTPUT_FILE)
-            logger.info(f"Carregado {len(df)} resultados do {OUTPUT_FILE.name}")
-            return df
-        except Exception as e:
-            logger.error(f"Falha ao ler {OUTPUT_FILE}: {e}")
-            return pd.DataFrame()
-    return pd.DataFrame()
-
-
-def list_temp_batches() -> list:
-    """Retorna lista de arquivos parquet temporários gerados por batches."""
-    return sorted(TEMP_BATCH_DIR.glob("*.parquet"))
-
-
-def load_all_progress() -> pd.DataFrame:
-    """
-    Constrói o dataframe com tudo que já foi processado:
-    - Primeiro o parquet final (se houver)
-    - Depois todos os temp batches (apêndice)
-    Isso permite continuar mesmo sem mesclar ainda o final.
-    """
-    dfs = []
-    df_final = load_final_results()
-    if not df_final.empty:
-        dfs.append(df_final)
-
-    for p in list_temp_batches():
-        try:
-            d = pd.read_parquet(p)
-            dfs.append(d)
-        except Exception as e:
-            logger.error(f"Não foi possível ler batch {p.name}: {e}")
-
-    if dfs:
-        df_all = pd.concat(dfs, ignore_index=True)
-        return df_all
-    return pd.DataFrame()
-
-
-# =======================================
-# FUNÇÕES DE SALVAMENTO DE BATCHES TEMPORÁRIOS
-# =======================================
-def save_batch_temp(df_batch: pd.DataFrame, tag: str | None = None) -> Path:
-    """Salva um dataframe de batch como parquet temporário identificado por tag+uuid."""
-    if tag is None:
-        tag = "batch"
-    timestamp = datetime.now().strftime("%Y%m%dT%H%M%S")
-    uid = uuid.uuid4().hex[:8]
-    fname = f"{tag}_{timestamp}_{uid}.parquet"
-    path = TEMP_BATCH_DIR / fname
-    df_batch.to_parquet(path, index=False)
-    logger.info(f"Batch temporário salvo: {path.name} ({len(df_batch)} linhas)")
-    return path
-
-
-# =======================================
-# FUNÇÃO DE CONSOLIDAÇÃO FINAL ATÔMICA
-# =======================================
-def consolidate_all_to_final():
-    """
-    Consolida todos os temp batches + final (se existir) em OUTPUT_FILE de forma atômica.
-    Após escrita com sucesso, apaga os temp batches.
-    """
-    logger.info("Consolidando batches temporários no parquet final...")
-    parts = []
-
-    # Carrega final existente
-    if OUTPUT_FILE.exists():
-        try:
-            parts.append(pd.read_parquet(OUTPUT_FILE))
-        except Exception as e:
-            logger.error(f"Erro lendo final existente: {e}")
-
-    # Carrega batches temporários
-    for p in list_temp_batches():
-        try:
-            parts.append(pd.read_parquet(p))
-        except Exception as e:
-            logger.error(f"Erro lendo batch {p.name}: {e}")
-
-    if not parts:
-        logger.info("Nada para consolidar.")
-        return
-
-    # Concatena e deduplica por chave única
-    df_all = pd.concat(parts, ignore_index=True)
-    dedup_cols = [
-        "strategy",
-        "difficulty",
-        "run_index",
-        "bomb",
-        "travel_time",
-        "cell_size",
-    ]
-    df_all = df_all.drop_duplicates(subset=dedup_cols, keep="last").reset_index(
-        drop=True
-    )
-
-    # Escreve de forma atômica
-    try:
-        df_all.to_parquet(TEMP_MERGE_FILE, index=False)
-        Path(TEMP_MERGE_FILE).replace(OUTPUT_FILE)
-        logger.info(
-            f"Parquet final gravado com {len(df_all)} linhas em {OUTPUT_FILE.name}"
-        )
-
-        # Apagar batches temporários
-        for p in list_temp_batches():
-            try:
-                p.unlink()
-            except Exception:
-                logger.warning(f"Não foi possível apagar batch {p.name}")
-    except Exception as e:
-        logger.error(f"Erro ao gravar parquet final: {e}")
-        if Path(TEMP_MERGE_FILE).exists():
-            try:
-                Path(TEMP_MERGE_FILE).unlink()
-            except Exception:
-                pass
-        raise
-
-
-# =======================================
-# FUNÇÕES DE CONTROLE DE EXECUÇÃO
-# =======================================
-def build_already_done_set(df_progress: pd.DataFrame) -> set:
-    """Cria set de chaves já processadas a partir de um dataframe (ou vazio)."""
-    if df_progress is None or df_progress.empty:
-        return set()
-    keys = set(
-        zip(
-            df_progress["strategy"],
-            df_progress["run_index"],
-            df_progress["bomb"],
-            df_progress["travel_time"],
-            df_progress["cell_size"],
-        )
-    )
-    return keys
-
-
 # =======================================
 # FUNÇÕES PRINCIPAIS DE TESTE E EXECUÇÃO
 # =======================================
@@ -220,8 +78,7 @@ def run_tests(bot: Bot, strategy: DodgeStrategy, n_runs: int):
     cell_size_multipliers = [0.25, 0.5, 1.0, 1.5, 2.0, 3.0]
 
     # Carrega progresso atual (final + batches temporários)
-    df_progress = load_all_progress()
-    already_done = build_already_done_set(df_progress)
+    already_done = resultados.build_already_done_set()
 
     # Para cada combinação, executa um batch e salva parquet temporário ao final do batch
     for bomb in bombs_options:
@@ -247,7 +104,8 @@ def execute_runs(
 ):
     """
     Roda até n_runs para a tupla (strategy, bomb, travel_time, cell_size).
-    Ao final salva um parquet temporário para o batch (não altera OUTPUT_FILE).
+    Cada execução vai para o stream temporário do batch assim que termina
+    (não altera OUTPUT_FILE).
     """
     global COMPLETED_RUNS, SKIPPED_RUNS, START_TIME
     bot.think.set_travel_time_mult(travel_time)
@@ -256,7 +114,7 @@ def execute_runs(
     if batch_tag is None:
         batch_tag = f"{strategy.name}_bomb{bomb}_tt{travel_time}_cs{cell_size}"
 
-    df_new_rows = []
+    gravador = resultados.gravador(tag=batch_tag)
 
     for run_index in range(n_runs):
         key = (strategy.name, run_index, bomb, travel_time, cell_size)
@@ -286,7 +144,7 @@ def execute_runs(
             # OCR direto do ROI
             score = ocr_score(bot)
 
-            # Nova linha do dataframe
+            # Nova linha, gravada na hora
             row = {
                 "strategy": strategy.name,
                 "difficulty": "EASY",
@@ -297,7 +155,7 @@ def execute_runs(
                 "score": score,
                 "victory": victory,
             }
-            df_new_rows.append(row)
+            gravador.append(row)
             already_done.add(key)
 
             # Reinicia jogo
@@ -333,11 +191,8 @@ def execute_runs(
                     f"[{COMPLETED_RUNS}/{TOTAL_RUNS}] Última execução levou {timedelta(seconds=int(exec_time))} | ETA restante: {eta_str}"
                 )
 
-    # Ao fim do lote, salva um parquet temporário (apêndice)
-    if df_new_rows:
-        df_batch = pd.DataFrame(df_new_rows)
-        save_batch_temp(df_batch, tag=batch_tag)
-    else:
+    gravador.close()
+    if not gravador.linhas:
         logger.info("Nenhuma nova linha gerada neste batch.")
 
 
@@ -346,6 +201,8 @@ def execute_runs(
 # =======================================
 if __name__ == "__main__":
     bot = Bot(DodgeStrategy.MIX_DISTANCIA_DENSIDADE)
+    # Carrega o leitor do score antes da primeira partida (fora do tempo medido)
+    modelos.easyocr_reader(["en"], gpu=True)
     while not bot.is_active():
         time.sleep(1)
 
@@ -382,15 +239,17 @@ if __name__ == "__main__":
     # }
 
     # # Sobrescreve parquet final para não misturar com os outros
-    # OUTPUT_FILE = RESULTADOS_DIR / "resultados_dodge_best.parquet"
-    # TEMP_MERGE_FILE = RESULTADOS_DIR / "resultados_dodge_best.parquet.tmp"
+    # resultados = Resultados(
+    #     RESULTADOS_DIR / "resultados_dodge_best.parquet",
+    #     chaves=resultados.chaves,
+    #     temp_dir=RESULTADOS_DIR / "temp_batches_best",
+    # )
 
     # # Calcula total de execuções (só para ETA)
     # TOTAL_RUNS = len(best_params) * N_RUNS
 
     # # Carrega progresso existente desse parquet (se já rodou algo)
-    # df_progress = load_all_progress()
-    # already_done = build_already_done_set(df_progress)
+    # already_done = resultados.build_already_done_set()
 
     # # Roda cada estratégia com seus parâmetros fixos
     # for strategy, params in best_params.items():
@@ -406,9 +265,11 @@ if __name__ == "__main__":
     #         batch_tag=f"best_{strategy.name}",
     #     )
 
-    # Consolida todos os batches temporários em um parquet final atômico
+    # Acrescenta os streams temporários ao dataset final
     try:
-        consolidate_all_to_final()
+        # O final de versões anteriores era um parquet único: vira pasta aqui
+        resultados.migrar_parquet_unico()
+        resultados.consolidate_all_to_final()
         logger.info("Execução finalizada. Resultados consolidados.")
     except Exception as e:
         logger.error(f"Erro durante a consolidação final: {e}")
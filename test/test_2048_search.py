@@ -0,0 +1,76 @@
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "2048"))
+
+from core import bitboard  # noqa: E402
+from core.ntuple import NTupleNetwork  # noqa: E402
+from core.search import Expectimax, ExpectimaxParalelo  # noqa: E402
+
+# Tolerância (s) além do time_budget: última conferência do prazo e retorno
+FOLGA_PRAZO = 0.1
+
+# Só left/right juntam os 2; up é válido, mas não pontua
+BOARD_JUNCAO = np.array(
+    [
+        [0, 0, 0, 0],
+        [0, 0, 0, 0],
+        [0, 0, 0, 0],
+        [2, 2, 0, 8],
+    ]
+)
+
+
+def _busca_ntuple(classe, **kwargs) -> Expectimax:
+    rede = NTupleNetwork()
+    return classe(
+        depth=1,
+        avaliar=rede.avaliar,
+        valor_perda=rede.valor_perda(),
+        afterstates=True,
+        **kwargs,
+    )
+
+
+def test_ntuple_depth_1_escolhe_juncao():
+    busca = _busca_ntuple(Expectimax)
+    move, _ = busca.best_move(bitboard.encode(BOARD_JUNCAO))
+    assert move in ("left", "right")
+
+
+def test_ntuple_paralelo_depth_1_escolhe_juncao():
+    busca = _busca_ntuple(ExpectimaxParalelo, workers=1)
+    try:
+        move, _ = busca.best_move(bitboard.encode(BOARD_JUNCAO))
+    finally:
+        busca.close()
+    assert move in ("left", "right")
+
+
+def test_paralelo_spawn_primeiro_movimento_respeita_prazo():
+    busca = ExpectimaxParalelo(time_budget=0.2, workers=2, contexto="spawn")
+    try:
+        busca.aquecer()
+        inicio = time.perf_counter()
+        move, _ = busca.best_move(bitboard.encode(BOARD_JUNCAO))
+        duracao = time.perf_counter() - inicio
+    finally:
+        busca.close()
+    assert move is not None
+    assert duracao < 0.2 + FOLGA_PRAZO
+
+
+def test_paralelo_spawn_sem_aquecer_respeita_prazo():
+    # Pool subindo dentro da jogada: a profundidade 1 é resolvida localmente
+    busca = ExpectimaxParalelo(time_budget=0.2, workers=2, contexto="spawn")
+    try:
+        inicio = time.perf_counter()
+        move, _ = busca.best_move(bitboard.encode(BOARD_JUNCAO))
+        duracao = time.perf_counter() - inicio
+    finally:
+        busca.close()
+    assert move is not None
+    assert duracao < 0.2 + FOLGA_PRAZO